@@ -0,0 +1,211 @@
+import argparse
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+# Import modular components
+from Lexer.Lexer import Lexer
+from Parser.Parser import Parser
+from Interpreter.Interpreter import Interpreter
+from Interpreter.Exceptions import ReturnException
+from Interpreter.Program import Program
+from Interpreter.InputSource import ReplayInput
+from Parser.Parallel import parse_parallel
+from Parser.Incremental import IncrementalParser
+from Parser.Inline import Inliner
+
+REQUESTS = 2000
+REQUEST_FILE = 'Benchmarks/Request.mylang'
+
+def make_order(i):
+    return {"customer": f"c{i}", "items": [{"qty": 1 + i % 5, "price": 9.99 * (1 + k)} for k in range(5)]}
+
+# Serve REQUESTS requests the way embedding code did before prepared
+# programs: lex, parse and build an interpreter for every request.
+def per_call_pipeline():
+    with open(REQUEST_FILE) as f:
+        source_code = f.read()
+    for i in range(REQUESTS):
+        interpreter = Interpreter()
+        interpreter.env.set("order", make_order(i))
+        try:
+            interpreter.eval(Parser(Lexer(source_code).tokenize()).parse())
+        except ReturnException:
+            pass
+
+# Serve the same requests from a program prepared once.
+def prepared_program():
+    program = Program.prepare_file(REQUEST_FILE)
+    for i in range(REQUESTS):
+        program.run({"order": make_order(i)})
+
+# Serve the same requests from one prepared program shared by a pool of
+# threads. Throughput only scales with threads on free-threaded CPython.
+def threaded_requests(threads):
+    def serve():
+        program = Program.prepare_file(REQUEST_FILE)
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(lambda i: program.run({"order": make_order(i)}), range(REQUESTS * 4)))
+    return (f"{REQUESTS * 4} requests, {threads} thread(s)", serve)
+
+# A large generated source of functions, conditionals and literals
+def generated_source(copies=20000):
+    parts = []
+    for i in range(copies):
+        parts.append(f'function f{i}(a, b) {{\n    if (a > b) {{ return a - b; }}\n    else {{ return b * 2 + a; }}\n}}\n')
+        parts.append(f'x{i} = f{i}({i}, 3) + [1, 2, "s{i}"][0];\n')
+        parts.append(f'define d{i} {{"k": {i}, "v": [{i}, 2]}};\n')
+    return "".join(parts)
+
+# Lex and parse the generated source serially or with a number of workers
+def parse_case(workers):
+    def parse():
+        source = generated_source()
+        if workers:
+            parse_parallel(source, workers)
+        else:
+            Parser(Lexer(source).tokenize()).parse()
+    return (f"parse, {workers} worker(s)" if workers else "parse, serial", parse)
+
+# Re-parse a generated source after editing one statement in its middle, as
+# watch mode does on save, or parse the edited source from scratch. Only the
+# re-parse is timed; the first parse is setup.
+def reparse_case(copies, incremental):
+    def reparse():
+        source = generated_source(copies)
+        middle = copies // 2
+        edited = source.replace(f"x{middle} = f{middle}({middle}, 3)", f"x{middle} = f{middle}({middle}, 4)")
+        parser = IncrementalParser()
+        if incremental:
+            parser.parse(source)
+        start = time.perf_counter()
+        parser.parse(edited)
+        return time.perf_counter() - start
+    mode = "incremental" if incremental else "full"
+    return (f"{copies * 3} statements, {mode}", reparse)
+
+# A graph program run with its `n = ...;` line replaced, so that timings at
+# two sizes show how each version of the algorithm scales
+def sized_case(filename, n):
+    def run():
+        with open(filename) as f:
+            source = re.sub(r'^n = \d+;', f'n = {n};', f.read(), count=1, flags=re.M)
+        start = time.perf_counter()
+        Interpreter().eval(Parser(Lexer(source).tokenize()).parse())
+        return time.perf_counter() - start
+    return (f"{os.path.basename(filename)}, n = {n}", run)
+
+# Each benchmark is a group of programs (or Python callables, given as
+# (label, function) pairs, or programs with Interpreter options, given as
+# (filename, options) pairs) doing the same work in different ways; their
+# timings are printed side by side.
+BENCHMARKS = {
+    'sum-list': ['Benchmarks/SumWhile.mylang', 'Benchmarks/SumFor.mylang'],
+    'quicken': [
+        ('Benchmarks/ArithLoop.mylang', {'quicken': False}),
+        'Benchmarks/ArithLoop.mylang',
+    ],
+    'embed-requests': [
+        (f"{REQUESTS} requests, parse per call", per_call_pipeline),
+        (f"{REQUESTS} requests, prepared program", prepared_program),
+    ],
+    'threads': [threaded_requests(n) for n in (1, 2, 4, 8)],
+    'parallel-parse': [parse_case(n) for n in (0, 2, 4, 8)],
+    'interactive': ['Benchmarks/ShoppingList.mylang'],
+    'pipeline': ['Benchmarks/PipelineLists.mylang', 'Benchmarks/PipelineGenerators.mylang'],
+    'watch': [reparse_case(n, incremental) for n in (1000, 10000) for incremental in (False, True)],
+    'pass-values': [
+        'Benchmarks/PassCopy.mylang',
+        ('Benchmarks/PassValue.mylang', {'value_semantics': True}),
+    ],
+    'bfs': [sized_case(f'Benchmarks/{name}.mylang', n) for n in (10000, 40000) for name in ('BFSList', 'BFSDeque')],
+    'dijkstra': [sized_case(f'Benchmarks/{name}.mylang', n) for n in (300, 1200) for name in ('DijkstraList', 'DijkstraHeap')],
+    'guards': [
+        'Benchmarks/GuardsEager.mylang',
+        'Benchmarks/GuardsNested.mylang',
+        'Benchmarks/GuardsShortCircuit.mylang',
+    ],
+    'stats': [
+        'Benchmarks/CallHeavy.mylang',
+        ('Benchmarks/CallHeavy.mylang', {'stats': False}),
+        ('Benchmarks/CallHeavy.mylang', {'jit': False}),
+        ('Benchmarks/CallHeavy.mylang', {'jit': False, 'stats': False}),
+    ],
+    'inline': [
+        'Benchmarks/CallHeavy.mylang',
+        ('Benchmarks/CallHeavy.mylang', {'inline': True}),
+        ('Benchmarks/CallHeavy.mylang', {'jit': False}),
+        ('Benchmarks/CallHeavy.mylang', {'jit': False, 'inline': True}),
+    ],
+}
+
+# Recorded input() responses replayed when a program is benchmarked
+def recording_for(filename):
+    path = os.path.splitext(filename)[0] + '.input.jsonl'
+    return path if os.path.exists(path) else None
+
+# Run one program from source to completion and return the elapsed seconds.
+# Output is captured so printing does not distort the timing, and programs
+# that ask for input are answered from their recording (see recording_for).
+# inline=True runs the inlining pass (see Parser/Inline.py) after parsing.
+def run_program(filename, inline=False, **options):
+    with open(filename) as f:
+        source_code = f.read()
+    recording = recording_for(filename)
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        ast = Parser(Lexer(source_code).tokenize()).parse()
+        if inline:
+            ast = Inliner().run(ast)
+        interpreter = Interpreter(**options)
+        if recording:
+            interpreter.input = ReplayInput(recording)
+        interpreter.eval(ast)
+    return time.perf_counter() - start
+
+# Functions that time themselves, to leave out their setup, return the
+# elapsed seconds.
+def run_function(function):
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        elapsed = function()
+    return time.perf_counter() - start if elapsed is None else elapsed
+
+# Label and zero-argument timer for one entry of a benchmark group
+def run_case(case):
+    if isinstance(case, str):
+        return case, lambda: run_program(case)
+    label, function = case
+    if isinstance(function, dict):
+        options = ", ".join(key if value is True else f"{key}={value}" for key, value in function.items())
+        return f"{label} ({options})", lambda: run_program(label, **function)
+    return label, lambda: run_function(function)
+
+def main():
+    arg_parser = argparse.ArgumentParser(prog="Benchmark.py")
+    arg_parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per program; the best is reported")
+    args = arg_parser.parse_args()
+
+    # sys._is_gil_enabled only exists on 3.13+; older builds always have the GIL
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, {os.cpu_count()} core(s)")
+
+    for name in args.names or BENCHMARKS:
+        if name not in BENCHMARKS:
+            print(f"❌ Unknown benchmark: {name}")
+            continue
+        print(f"{name}:")
+        baseline = None
+        for case in BENCHMARKS[name]:
+            label, run = run_case(case)
+            best = min(run() for _ in range(args.repeat))
+            baseline = baseline or best
+            print(f"  {label:<48}{best:>8.3f}s{baseline / best:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Builtin functions available to every script. User-defined functions with
+# the same name take precedence. Each builtin receives evaluated arguments;
+# numbers arrive as floats and are converted where Python needs integers.
+from .DataFiles import read_json, read_csv, iter_csv, iter_lines
+from .Collections import Deque, Heap, Set
+
+def to_int(value):
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise RuntimeError(f"Expected a whole number, got {value}")
+        return int(value)
+    return value
+
+
+# range(stop), range(start, stop) or range(start, stop, step): a lazy
+# sequence of integers, iterated without building a list
+def builtin_range(*args):
+    if not 1 <= len(args) <= 3:
+        raise RuntimeError("range expects 1 to 3 arguments")
+    return range(*[to_int(a) for a in args])
+
+
+def builtin_len(value):
+    return len(value)
+
+
+# list(x): a list of the items of a list, range or string, or of a dict's keys
+def builtin_list(value):
+    return list(value)
+
+
+# number(text): parse a string (e.g. a CSV field) as a number
+def builtin_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise RuntimeError(f"Not a number: {value}")
+
+
+# set(items), deque(items) and heap(items): new collections (see
+# Collections.py), empty or holding the items of a list, range, generator etc.
+def builtin_set(items=()):
+    return Set(items)
+
+
+def builtin_deque(items=()):
+    return Deque(items)
+
+
+def builtin_heap(items=()):
+    return Heap(items)
+
+
+def collection(value, name):
+    if not isinstance(value, (Set, Deque, Heap)):
+        raise RuntimeError(f"{name} expects a set, deque or heap, got {type(value).__name__}")
+    return value
+
+
+# push(c, x): add x to a set, to the back of a deque, or to a heap
+def builtin_push(container, item):
+    container = collection(container, 'push')
+    if isinstance(container, Set):
+        container.add(item)
+    elif isinstance(container, Deque):
+        container.append(item)
+    else:
+        container.push(item)
+
+
+# pop(c): remove and return the front of a deque, the smallest item of a heap
+# or any member of a set
+def builtin_pop(container):
+    container = collection(container, 'pop')
+    if not container:
+        raise RuntimeError(f"pop from an empty {type(container).__name__.lower()}")
+    return container.popleft() if isinstance(container, Deque) else container.pop()
+
+
+# peek(c): what pop(c) would return, without removing it
+def builtin_peek(container):
+    container = collection(container, 'peek')
+    if not container:
+        raise RuntimeError(f"peek at an empty {type(container).__name__.lower()}")
+    return next(iter(container)) if isinstance(container, Set) else container[0]
+
+
+# push_front(d, x) and pop_back(d): the other ends of a deque
+def builtin_push_front(container, item):
+    if not isinstance(container, Deque):
+        raise RuntimeError("push_front expects a deque")
+    container.appendleft(item)
+
+
+def builtin_pop_back(container):
+    if not isinstance(container, Deque):
+        raise RuntimeError("pop_back expects a deque")
+    if not container:
+        raise RuntimeError("pop from an empty deque")
+    return container.pop()
+
+
+# has(c, x): whether x is in a set, deque, heap or list, or is a key of a dict
+def builtin_has(container, item):
+    return item in container
+
+
+BUILTINS = {
+    'range': builtin_range,
+    'len': builtin_len,
+    'list': builtin_list,
+    'number': builtin_number,
+    'read_json': read_json,
+    'read_csv': read_csv,
+    'iter_csv': iter_csv,
+    'iter_lines': iter_lines,
+    'set': builtin_set,
+    'deque': builtin_deque,
+    'heap': builtin_heap,
+    'push': builtin_push,
+    'pop': builtin_pop,
+    'peek': builtin_peek,
+    'push_front': builtin_push_front,
+    'pop_back': builtin_pop_back,
+    'has': builtin_has,
+}
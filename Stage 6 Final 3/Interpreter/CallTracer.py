@@ -0,0 +1,22 @@
+# CallTracer prints every user-defined function call and return, indented by
+# call depth, using the interpreter's call, return and unwind hooks.
+import sys
+
+
+class CallTracer:
+    def __init__(self, out=sys.stderr):
+        self.out = out
+        self.depth = 0
+
+    def on_call(self, func_def, args):
+        shown = ", ".join(repr(arg) for arg in args)
+        print(f"{'  ' * self.depth}→ {func_def.name}({shown})", file=self.out)
+        self.depth += 1
+
+    def on_return(self, func_def, result):
+        self.depth -= 1
+        print(f"{'  ' * self.depth}← {func_def.name} = {result!r}", file=self.out)
+
+    def on_unwind(self, func_def, error):
+        self.depth -= 1
+        print(f"{'  ' * self.depth}✗ {func_def.name}: {type(error).__name__}: {error}", file=self.out)
@@ -0,0 +1,89 @@
+# Native collection values backed by Python's set, collections.deque and
+# heapq. They work with the language's existing syntax through the Python
+# item protocol, so indexing, ammend and remove need no special cases in the
+# interpreter or in JIT-compiled code:
+#
+#   set      s[x] is true when x is a member; ammend s[x] to true/false adds
+#            or discards x; remove s[x]; removes it
+#   deque    d[i] / ammend d[i] to v / remove d[i]; as for a list, O(1) at
+#            either end
+#   heap     h[0] is the smallest item; remove h[0]; takes it out in O(log n)
+#
+# The push/pop/peek/has builtins (see Builtins.py) cover the rest.
+import heapq
+from collections import deque
+
+
+class Set(set):
+    def __getitem__(self, item):
+        return item in self
+
+    def __setitem__(self, item, member):
+        if member:
+            self.add(item)
+        else:
+            self.discard(item)
+
+    def __delitem__(self, item):
+        try:
+            self.remove(item)
+        except KeyError:
+            raise RuntimeError(f"{item!r} is not in the set")
+
+    def __repr__(self):
+        return "{" + ", ".join(map(repr, self)) + "}" if self else "set()"
+
+
+class Deque(deque):
+    def __repr__(self):
+        return "deque" + repr(list(self))
+
+
+# A binary min-heap. Items must be comparable with each other; a list such as
+# [priority, value] orders by its first element.
+class Heap:
+    def __init__(self, items=()):
+        self.items = list(items)
+        comparable(heapq.heapify, self.items)
+
+    def push(self, item):
+        comparable(heapq.heappush, self.items, item)
+
+    def pop(self):
+        if not self.items:
+            raise RuntimeError("pop from an empty heap")
+        return heapq.heappop(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    # Iteration is in ascending order and leaves the heap unchanged
+    def __iter__(self):
+        return iter(sorted(self.items))
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __setitem__(self, index, item):
+        raise RuntimeError("Heap items cannot be replaced; use push and pop")
+
+    def __delitem__(self, index):
+        if index == 0:
+            heapq.heappop(self.items)
+            return
+        # Anything but the smallest item costs a re-heapify
+        del self.items[index]
+        heapq.heapify(self.items)
+
+    def __repr__(self):
+        return "heap" + repr(sorted(self.items))
+
+
+def comparable(operation, *args):
+    try:
+        operation(*args)
+    except TypeError:
+        raise RuntimeError("Heap items must be comparable with each other (e.g. all numbers)")
@@ -0,0 +1,122 @@
+# Value semantics through copy-on-write. With Interpreter(value_semantics=True)
+# lists and dicts behave as values: assigning one, passing it to a function or
+# storing it in another container never lets a later ammend/remove through one
+# name show up through another. Nothing is copied when a value is bound;
+# instead the container is marked shared, and the first write through a
+# shared container copies it (one level, marking its own items shared) and
+# rebinds the name or slot that was written through to the private copy.
+#
+# Invariant: a CowList/CowDict whose shared flag is False is reachable from at
+# most one variable or container slot, so it may be written in place.
+from Parser.Nodes import BinOp, DictExpr, IndexExpr, ListExpr, Var
+from .Collections import Deque, Heap
+
+
+class CowList(list):
+    __slots__ = ('shared',)
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self.shared = False
+
+
+class CowDict(dict):
+    __slots__ = ('shared',)
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self.shared = False
+
+
+COW_TYPES = (CowList, CowDict)
+PLAIN_TYPES = (list, dict)
+
+
+# A second reference to value is being made
+def share(value):
+    if type(value) in COW_TYPES:
+        value.shared = True
+    return value
+
+
+# A value bound to a name while something else holds it too (a loop's
+# collection or iterator, the caller injecting a global). Plain lists and
+# dicts, e.g. from builtins, become copy-on-write first.
+def bound(value):
+    return share(cow(value))
+
+
+def share_items(container):
+    for item in (container.values() if type(container) is CowDict else container):
+        if type(item) in COW_TYPES:
+            item.shared = True
+
+
+# Whether evaluating node always builds a new container nobody else holds
+def is_fresh(node):
+    return isinstance(node, (ListExpr, DictExpr)) or (isinstance(node, BinOp) and node.op == '+')
+
+
+def private_copy(value):
+    copy = type(value)(value)
+    # The items are now held by both containers
+    share_items(copy)
+    return copy
+
+
+# Convert plain Python lists and dicts (e.g. from builtins) to their
+# copy-on-write versions, all the way down. Items are only visited one by one
+# when the container holds other containers.
+def cow(value):
+    if type(value) is list:
+        result = CowList(value)
+        kinds = set(map(type, result))
+        if not kinds.isdisjoint(PLAIN_TYPES):
+            result[:] = map(cow, result)
+    elif type(value) is dict:
+        result = CowDict(value)
+        kinds = set(map(type, result.values()))
+        if not kinds.isdisjoint(PLAIN_TYPES):
+            result.update([(k, cow(v)) for k, v in result.items()])
+    elif type(value) in (Deque, Heap):
+        # deque(items) and heap(items) hold the items of a value too
+        share_items(value.items if type(value) is Heap else value)
+        return value
+    else:
+        return value
+    # e.g. list(items) copies a list whose items are themselves values
+    if not kinds.isdisjoint(COW_TYPES):
+        share_items(result)
+    return result
+
+
+# Evaluate the container an ammend/remove writes to, copying every shared
+# container on the way from the variable down to it.
+def writable(interp, node):
+    if isinstance(node, Var):
+        env = interp.env
+        while env is not None and node.name not in env.vars:
+            env = env.parent
+        if env is None:
+            return interp.env.get(node.name)
+        value = env.vars[node.name]
+        if type(value) in COW_TYPES and value.shared:
+            value = env.vars[node.name] = private_copy(value)
+        return value
+
+    if isinstance(node, IndexExpr):
+        parent = writable(interp, node.base)
+        index = interp.eval(node.index)
+        if isinstance(index, float) and index.is_integer():
+            index = int(index)
+        value = parent[index]
+        if type(value) in COW_TYPES and value.shared:
+            value = parent[index] = private_copy(value)
+        return value
+
+    # Any other expression yields a temporary; writing to a shared one must
+    # still not affect its other holders
+    value = interp.eval(node)
+    if type(value) in COW_TYPES and value.shared:
+        value = private_copy(value)
+    return value
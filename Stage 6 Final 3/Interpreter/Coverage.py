@@ -0,0 +1,27 @@
+# Coverage collects which statement lines of a program ran, using the
+# interpreter's enter hook. Install it with interpreter.hooks.install().
+from Parser.Walk import walk
+
+
+class Coverage:
+    def __init__(self):
+        self.executed = set()
+
+    def on_enter(self, node):
+        line = node.__dict__.get('line')
+        if line is not None:
+            self.executed.add(line)
+
+    # Statement lines of a program's AST, including those inside functions.
+    def executable_lines(self, ast):
+        return {node.line for node in walk(ast) if node.__dict__.get('line') is not None}
+
+    def report(self, ast):
+        lines = self.executable_lines(ast)
+        covered = lines & self.executed
+        missed = sorted(lines - covered)
+        percent = len(covered) / len(lines) if lines else 1.0
+        text = f"coverage: {len(covered)}/{len(lines)} lines ({percent:.0%})"
+        if missed:
+            text += "\nmissed lines: " + ", ".join(str(line) for line in missed)
+        return text
@@ -0,0 +1,58 @@
+# Data file builtins: bulk loading of JSON and CSV files into lists and
+# dictionaries with Python's C-accelerated parsers, plus lazy row and line
+# iterators for files too large to load at once. Files of at least
+# MMAP_THRESHOLD bytes are memory-mapped while they are streamed.
+import csv
+import json
+import mmap
+import os
+
+MMAP_THRESHOLD = 64 << 20
+
+
+def check_exists(path):
+    if not os.path.exists(path):
+        raise RuntimeError(f"File not found: {path}")
+
+
+# Yield the lines of a text file, line endings included.
+def stream(path):
+    check_exists(path)
+    if os.path.getsize(path) >= MMAP_THRESHOLD:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b''):
+                yield raw.decode('utf-8')
+    else:
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from f
+
+
+# Rows as lists of strings, or as dictionaries keyed by the header row.
+def csv_rows(lines, header):
+    return csv.DictReader(lines) if header else csv.reader(lines)
+
+
+# read_json(path): the whole document as lists, dictionaries and values
+def read_json(path):
+    check_exists(path)
+    with open(path, encoding='utf-8') as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Invalid JSON in {path}: {e}")
+
+
+# read_csv(path) / read_csv(path, true): every row loaded into a list
+def read_csv(path, header=False):
+    return list(csv_rows(stream(path), header))
+
+
+# iter_csv(path) / iter_csv(path, true): rows parsed one at a time
+def iter_csv(path, header=False):
+    yield from csv_rows(stream(path), header)
+
+
+# iter_lines(path): each line without its line ending, one at a time
+def iter_lines(path):
+    for line in stream(path):
+        yield line.rstrip('\r\n')
@@ -5,3 +5,9 @@ class ReturnException(Exception):
     def __init__(self, value):
         # Store the return value so it can be caught and used
         self.value = value
+
+
+# MemoryLimitError is raised when the values held by a script grow past
+# the interpreter's configured memory limit.
+class MemoryLimitError(RuntimeError):
+    pass
@@ -0,0 +1,127 @@
+# Generator functions: a function whose body contains `yield` returns a
+# Generator when called. Nothing in the body runs until the Generator is
+# iterated (by a for loop or a builtin such as list); each step runs the body
+# up to its next yield and hands that value to the consumer, so a pipeline of
+# generators holds one element per stage instead of a whole list.
+#
+# Statements that contain a yield are executed by steps() below, which is a
+# Python generator and so can be suspended in the middle of a loop; all other
+# statements and every expression go through the ordinary Interpreter.eval.
+# Hooks (and so coverage) see both kinds.
+# A return statement, or running off the end of the body, ends the iteration;
+# the returned value is discarded.
+from Parser.Nodes import Block, For, FuncDef, If, Return, While, Yield
+from Parser.Walk import children
+from .Environment import Environment
+from .Exceptions import ReturnException
+
+
+# Whether a statement contains a yield of the function it belongs to (nested
+# function definitions are separate). Cached on the node.
+def contains_yield(node):
+    cached = node.__dict__.get('yields')
+    if cached is None:
+        cached = isinstance(node, Yield) or (
+            not isinstance(node, FuncDef) and any(contains_yield(c) for c in children(node))
+        )
+        node.yields = cached
+    return cached
+
+
+def steps(interp, node):
+    if not contains_yield(node):
+        interp.eval(node)
+    elif interp.hooks.traces_nodes():
+        yield from traced_steps(interp, node)
+    else:
+        yield from statement_steps(interp, node)
+
+
+# Fires the enter, exit and exception hooks for a statement run by steps(),
+# as Interpreter.traced_eval does for the others
+def traced_steps(interp, node):
+    callbacks = interp.hooks.callbacks
+    for callback in callbacks['enter']:
+        callback(node)
+    try:
+        yield from statement_steps(interp, node)
+    except ReturnException:
+        raise
+    except Exception as e:
+        if not getattr(e, 'hooked', False):
+            e.hooked = True
+            for callback in callbacks['exception']:
+                callback(node, e)
+        raise
+    for callback in callbacks['exit']:
+        callback(node, None)
+
+
+def statement_steps(interp, node):
+    if isinstance(node, Yield):
+        yield interp.eval(node.expr)
+
+    elif isinstance(node, Block):
+        for stmt in node.stmts:
+            yield from steps(interp, stmt)
+
+    elif isinstance(node, If):
+        if interp.eval(node.cond):
+            yield from steps(interp, node.then_)
+        elif node.else_:
+            yield from steps(interp, node.else_)
+
+    elif isinstance(node, While):
+        while interp.eval(node.cond):
+            yield from steps(interp, node.body)
+
+    elif isinstance(node, For):
+        for item in interp.loop_items(node):
+            interp.env.set(node.var, item)
+            yield from steps(interp, node.body)
+
+    elif isinstance(node, Return):
+        interp.eval(node.expr)
+        return
+
+    else:
+        raise RuntimeError(f"'yield' is not allowed inside {type(node).__name__}")
+
+
+# Generator is the lazy iterator returned by calling a generator function. Its
+# local scope is created at the call, with the caller's scope as parent, as
+# for any other call; each step runs with that scope current and restores the
+# consumer's afterwards.
+class Generator:
+    def __init__(self, interp, func_def, args):
+        self.interp = interp
+        self.name = func_def.name
+        self.env = Environment(parent=interp.env)
+        if interp.stats.enabled:
+            interp.stats.calls += 1
+            interp.stats.environments += 1
+        for param, arg in zip(func_def.params, args):
+            self.env.set(param, arg)
+        self.steps = steps(interp, func_def.body)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        interp = self.interp
+        consumer = interp.env
+        # Keep the consumer's scope visible to the memory tracker meanwhile
+        interp.outer_envs.append(consumer)
+        interp.env = self.env
+        try:
+            return next(self.steps)
+        except ReturnException:
+            # A return inside a statement without yields
+            self.steps.close()
+            raise StopIteration
+        finally:
+            interp.env = consumer
+            interp.outer_envs.pop()
+
+    def __repr__(self):
+        return f"<generator {self.name}>"
@@ -0,0 +1,52 @@
+# Execution hooks, in the spirit of sys.settrace but at the .mylang level.
+# Callbacks are registered per event:
+#
+#   enter(node)                 before a node is evaluated
+#   exit(node, result)          after a node is evaluated
+#   call(func_def, args)        when a user-defined function is entered
+#   return(func_def, result)    when it returns
+#   unwind(func_def, error)     when it is left by an error instead
+#   exception(node, error)      where a runtime error is first raised
+#
+# The interpreter only switches to its instrumented evaluator while hooks
+# are registered, so the default path carries no extra checks.
+
+EVENTS = ('enter', 'exit', 'call', 'return', 'unwind', 'exception')
+
+
+class HookRegistry:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.callbacks = {event: [] for event in EVENTS}
+
+    def add(self, event, callback):
+        if event not in self.callbacks:
+            raise ValueError(f"Unknown hook event: {event}")
+        self.callbacks[event].append(callback)
+        self.interpreter.instrument()
+
+    def remove(self, event, callback):
+        self.callbacks[event].remove(callback)
+        self.interpreter.instrument()
+
+    # Register every on_<event> method an object defines (e.g. Coverage).
+    def install(self, consumer):
+        for event in EVENTS:
+            callback = getattr(consumer, f"on_{event}", None)
+            if callback:
+                self.add(event, callback)
+
+    def uninstall(self, consumer):
+        for event in EVENTS:
+            callback = getattr(consumer, f"on_{event}", None)
+            if callback in self.callbacks[event]:
+                self.remove(event, callback)
+
+    def traces_nodes(self):
+        return bool(self.callbacks['enter'] or self.callbacks['exit'] or self.callbacks['exception'])
+
+    def traces_calls(self):
+        return bool(self.callbacks['call'] or self.callbacks['return'] or self.callbacks['unwind'])
+
+    def active(self):
+        return any(self.callbacks.values())
@@ -0,0 +1,79 @@
+# Where the Input node's responses come from. The interpreter reads every
+# line through its input source, so a run can be recorded to a file and
+# replayed later without a terminal, or fed from stdin read all at once.
+# Recordings are JSON lines: {"prompt": ..., "response": ...} per Input.
+import json
+import sys
+
+
+# The terminal: prompt and read a line, like Python's input()
+class ConsoleInput:
+    def read(self, prompt):
+        return input(prompt)
+
+    def close(self):
+        pass
+
+
+# Reads from another source and logs each prompt/response pair to a file.
+class RecordingInput:
+    def __init__(self, path, source=None):
+        self.source = source or ConsoleInput()
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def read(self, prompt):
+        response = self.source.read(prompt)
+        self.file.write(json.dumps({'prompt': prompt, 'response': response}) + "\n")
+        # Keep the recording usable even if the script fails later
+        self.file.flush()
+        return response
+
+    def close(self):
+        self.file.close()
+        self.source.close()
+
+
+# Answers each Input from a recording, checking the prompts still match so a
+# changed script does not silently receive the wrong responses.
+class ReplayInput:
+    def __init__(self, path):
+        self.path = path
+        with open(path, encoding='utf-8') as f:
+            self.pairs = [json.loads(line) for line in f if line.strip()]
+        self.position = 0
+
+    def read(self, prompt):
+        if self.position >= len(self.pairs):
+            raise RuntimeError(
+                f"Replay {self.path} has no response for input #{self.position + 1} ({prompt!r})"
+            )
+        pair = self.pairs[self.position]
+        if pair['prompt'] != prompt:
+            raise RuntimeError(
+                f"Replay {self.path}: input #{self.position + 1} expected prompt "
+                f"{pair['prompt']!r}, got {prompt!r}"
+            )
+        self.position += 1
+        return pair['response']
+
+    def close(self):
+        pass
+
+
+# Reads all of a stream (stdin by default) up front; each Input takes the
+# next line. Prompts are not printed.
+class BulkInput:
+    def __init__(self, stream=None):
+        self.lines = (stream or sys.stdin).read().splitlines()
+        self.position = 0
+
+    def read(self, prompt):
+        if self.position >= len(self.lines):
+            # Same as input() at the end of stdin
+            raise EOFError(f"No input left for prompt {prompt!r}")
+        line = self.lines[self.position]
+        self.position += 1
+        return line
+
+    def close(self):
+        pass
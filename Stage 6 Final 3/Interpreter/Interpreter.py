@@ -2,15 +2,58 @@
 from Parser.Nodes import *
 from .Exceptions import ReturnException
 from .Environment import Environment
+from .Quicken import Quickener, QUICKENED
+from .JIT import JIT, THRESHOLD
+from .Memory import MemoryTracker
+from .Builtins import BUILTINS
+from .Modules import ModuleLoader
+from .Hooks import HookRegistry
+from .InputSource import ConsoleInput
+from .Generators import Generator
+from .Collections import Set
+from .Stats import RuntimeStats
+from .CopyOnWrite import COW_TYPES, CowDict, CowList, bound, cow, is_fresh, share, share_items, writable
 
 # Interpreter evaluates AST nodes based on their types.
 class Interpreter:
-    def __init__(self):
+    def __init__(self, quicken=True, jit=True, jit_threshold=THRESHOLD, jit_dump=False,
+                 memory_limit=None, value_semantics=False, stats=True):
         self.env = Environment()
         self.functions = {}
+        # Counters of what this interpreter did (see Stats.py)
+        self.stats = RuntimeStats(self, stats)
+        self.evaluated = 0
+        # Stream print writes to; None means sys.stdout
+        self.output = None
+        # Where Input reads responses from (see InputSource.py)
+        self.input = ConsoleInput()
+        # Approximate size of script values, with an optional cap (see Memory.py)
+        self.memory = MemoryTracker(self, memory_limit)
+        # Registers functions from imported .mylang files (see Modules.py)
+        self.modules = ModuleLoader(self)
+        # Tracing/debugging callbacks (see Hooks.py)
+        self.hooks = HookRegistry(self)
+        # Rewrites hot nodes into type-specialized variants (see Quicken.py)
+        self.quickener = Quickener() if quicken else None
+        # Lists and dicts behave as values, copied on write (see CopyOnWrite.py)
+        self.value_semantics = value_semantics
+        # Compiles hot functions to Python code (see JIT.py); compiled code
+        # shares containers by reference, so value semantics stay interpreted
+        self.jit = JIT(jit_threshold, jit_dump, stats) if jit and not value_semantics else None
+        # The JIT is set aside here while hooks are installed
+        self.suspended_jit = None
+        # FuncDef currently being interpreted, for loop hotness counting
+        self.current_function = None
+        # Scopes of code waiting for a generator step to finish (see Generators.py)
+        self.outer_envs = []
 
     # Evaluate an AST node.
     def eval(self, node):
+        self.evaluated += 1
+        # Quickened nodes carry their own specialized evaluator
+        if node.__class__ in QUICKENED:
+            return node.run(self)
+
         if isinstance(node, Block):
             return self.eval_block(node, self.env)
 
@@ -28,11 +71,15 @@ class Interpreter:
 
         # Variable lookup from environment
         elif isinstance(node, Var):
+            if self.quickener:
+                self.quickener.observe_var(node, self.env)
             return self.env.get(node.name)
 
         # Assignment: evaluate right-hand side and bind to name
         elif isinstance(node, Assign):
             val = self.eval(node.expr)
+            if self.value_semantics and type(val) in COW_TYPES and not is_fresh(node.expr):
+                val.shared = True
             self.env.set(node.name, val)
             return val
 
@@ -44,52 +91,34 @@ class Interpreter:
             if node.op == '!':
                 return not val
 
-        # Binary operation: evaluate both sides and apply operator
+        # Binary operation: evaluate both sides and apply operator. The right
+        # side of and/or is only evaluated when the left does not decide it.
         elif isinstance(node, BinOp):
             l = self.eval(node.l)
+            if node.op == 'and':
+                return self.eval(node.r) if l else l
+            if node.op == 'or':
+                return l if l else self.eval(node.r)
             r = self.eval(node.r)
-            if node.op == '+':
-                # Normalize float values that are integers (e.g. 5.0 → 5)
-                if isinstance(l, float) and l.is_integer():
-                    l = int(l)
-                if isinstance(r, float) and r.is_integer():
-                    r = int(r)
-                # Concatenate as string if either operand is a string
-                return str(l) + str(r) if isinstance(l, str) or isinstance(r, str) else l + r
-            elif node.op == '-':
-                return l - r
-            elif node.op == '*':
-                return l * r
-            elif node.op == '/':
-                return l / r
-            elif node.op == '==':
-                return l == r
-            elif node.op == '!=':
-                return l != r
-            elif node.op == '<':
-                return l < r
-            elif node.op == '<=':
-                return l <= r
-            elif node.op == '>':
-                return l > r
-            elif node.op == '>=':
-                return l >= r
-            elif node.op == 'and':
-                return l and r
-            elif node.op == 'or':
-                return l or r
+            if self.quickener:
+                self.quickener.observe_binop(node, l, r)
+            return self.binary_op(node.op, l, r)
+
+        # Conditional expression: evaluate only the branch that is taken
+        elif isinstance(node, CondExpr):
+            return self.eval(node.then_ if self.eval(node.cond) else node.else_)
 
         # Print statement: evaluate and display the expression
         elif isinstance(node, Print):
             val = self.eval(node.expr)
             if isinstance(val, float) and val.is_integer():
                 val = int(val)
-            print(val)
+            print(val, file=self.output)
 
         # Input: prompt user and return input value
         elif isinstance(node, Input):
             prompt = str(self.eval(node.prompt))
-            return input(prompt)
+            return self.memory.track(self.input.read(prompt))
 
         # If statement: evaluate condition and execute appropriate branch
         elif isinstance(node, If):
@@ -100,34 +129,79 @@ class Interpreter:
 
         # While loop: repeatedly evaluate body while condition is true
         elif isinstance(node, While):
+            iterations = 0
             while self.eval(node.cond):
                 self.eval_block(node.body, self.env)
+                iterations += 1
+            if self.jit and self.current_function:
+                self.jit.record_loop(self.current_function, iterations)
+
+        # For-each loop: bind each list item, dict key or range value in turn
+        elif isinstance(node, For):
+            iterations = 0
+            for item in self.loop_items(node):
+                self.env.set(node.var, item)
+                self.eval_block(node.body, self.env)
+                iterations += 1
+            if self.jit and self.current_function:
+                self.jit.record_loop(self.current_function, iterations)
 
         # List literal: evaluate all items and build a list
         elif isinstance(node, ListExpr):
-            return [self.eval(x) for x in node.items]
+            if self.value_semantics:
+                items = CowList(self.eval(x) for x in node.items)
+                share_items(items)
+                return self.memory.track(items)
+            return self.memory.track([self.eval(x) for x in node.items])
 
         # Dictionary literal: evaluate all key-value pairs
         elif isinstance(node, DictExpr):
-            return {self.eval(k): self.eval(v) for k, v in node.pairs}
+            if self.value_semantics:
+                pairs = CowDict((self.eval(k), self.eval(v)) for k, v in node.pairs)
+                share_items(pairs)
+                return self.memory.track(pairs)
+            return self.memory.track({self.eval(k): self.eval(v) for k, v in node.pairs})
+
+        # Set literal (see Collections.py)
+        elif isinstance(node, SetExpr):
+            return self.memory.track(Set(self.eval(x) for x in node.items))
 
         # Indexing: evaluate base and index to extract item
         elif isinstance(node, IndexExpr):
             base = self.eval(node.base)
             index = self.eval(node.index)
-            if isinstance(index, float) and index.is_integer():
-                index = int(index)
-            return base[index]
+            if self.quickener:
+                self.quickener.observe_index(node, base, index)
+            return self.index_value(base, index)
+
+        # Import: register another file's functions under its module name
+        elif isinstance(node, Import):
+            self.modules.import_module(node.path)
+
+        # Checkpoint: only meaningful to snapshot runs, which split the program there
+        elif isinstance(node, Checkpoint):
+            pass
 
         # Function definition: store function node by name
         elif isinstance(node, FuncDef):
             self.functions[node.name] = node
 
-        # Function call: resolve and execute user-defined function
+        # Function call: resolve and execute user-defined function or builtin
         elif isinstance(node, Call):
             func = self.functions.get(node.func)
             if not func:
-                raise RuntimeError(f"Function '{node.func}' not defined.")
+                builtin = BUILTINS.get(node.func)
+                if not builtin:
+                    raise RuntimeError(f"Function '{node.func}' not defined.")
+                args = [self.eval(arg) for arg in node.args]
+                if self.value_semantics:
+                    # A builtin may keep its arguments (push stores one)
+                    for arg in args:
+                        share(arg)
+                result = builtin(*args)
+                if self.value_semantics:
+                    result = cow(result)
+                return self.memory.track(result)
             args = [self.eval(arg) for arg in node.args]
             return self.call_function(func, args)
 
@@ -137,18 +211,24 @@ class Interpreter:
             raise ReturnException(val)
         
         elif isinstance(node, IndexAssign):
-            obj = self.eval(node.obj)
+            obj = writable(self, node.obj) if self.value_semantics else self.eval(node.obj)
             index = self.eval(node.index)
             value = self.eval(node.value)
+            if self.value_semantics and not is_fresh(node.value):
+                share(value)
 
             if isinstance(index, float) and index.is_integer():
                 index = int(index)
 
-            obj[index] = value
+            self.memory.store(obj, index, value)
             return value
 
+        # Yield: only runs as part of a generator (see Generators.py)
+        elif isinstance(node, Yield):
+            raise RuntimeError("'yield' can only run inside a generator function")
+
         elif isinstance(node, Remove):
-            container = self.eval(node.obj)
+            container = writable(self, node.obj) if self.value_semantics else self.eval(node.obj)
             key = self.eval(node.index)
             
             if isinstance(key, float) and key.is_integer():
@@ -160,15 +240,144 @@ class Interpreter:
             raise RuntimeError(f"Unknown node type: {type(node)}")
 
 
+    # The values a for loop binds its variable to, in turn. Under value
+    # semantics each is a copy-on-write value, also held by the collection
+    # (or builtin iterator) it came from.
+    def loop_items(self, node):
+        items = self.eval(node.iterable)
+        return map(bound, items) if self.value_semantics else items
+
+    # Create an interpreter for a separate execution of the same program.
+    # It shares this interpreter's quickener and JIT (so nodes and compiled
+    # functions warmed by one execution benefit the others) and starts with a
+    # copy of its function table, but has its own scopes, output, memory
+    # accounting and hooks. Spawned interpreters can run on different threads
+    # at the same time; a single interpreter must not.
+    def spawn(self):
+        child = Interpreter(quicken=False, jit=False, memory_limit=self.memory.limit,
+                            value_semantics=self.value_semantics, stats=self.stats.enabled)
+        child.quickener = self.quickener
+        child.jit = self.jit or self.suspended_jit
+        child.functions = dict(self.functions)
+        child.modules.base_dir = self.modules.base_dir
+        child.modules.disk_cache = self.modules.disk_cache
+        child.modules.names = dict(self.modules.names)
+        return child
+
+    # Switch between the plain and the instrumented evaluator as hooks are
+    # added or removed. The instrumented versions are installed as instance
+    # attributes shadowing eval/call_function, so the plain path is untouched.
+    def instrument(self):
+        if self.hooks.traces_nodes():
+            self.eval = self.traced_eval
+        else:
+            self.__dict__.pop('eval', None)
+        if self.hooks.traces_calls():
+            self.call_function = self.traced_call_function
+        else:
+            self.__dict__.pop('call_function', None)
+        # Compiled functions bypass eval, so hooked runs stay interpreted
+        if self.hooks.active():
+            if self.jit:
+                self.suspended_jit, self.jit = self.jit, None
+        elif self.suspended_jit:
+            self.jit, self.suspended_jit = self.suspended_jit, None
+
+    def traced_eval(self, node):
+        callbacks = self.hooks.callbacks
+        for callback in callbacks['enter']:
+            callback(node)
+        try:
+            result = Interpreter.eval(self, node)
+        except ReturnException:
+            raise
+        except Exception as e:
+            # Report the error once, at the innermost node that raised it
+            if not getattr(e, 'hooked', False):
+                e.hooked = True
+                for callback in callbacks['exception']:
+                    callback(node, e)
+            raise
+        for callback in callbacks['exit']:
+            callback(node, result)
+        return result
+
+    def traced_call_function(self, func_def, args):
+        callbacks = self.hooks.callbacks
+        for callback in callbacks['call']:
+            callback(func_def, args)
+        try:
+            result = Interpreter.call_function(self, func_def, args)
+        except Exception as e:
+            # Every call event is matched by a return or an unwind
+            for callback in callbacks['unwind']:
+                callback(func_def, e)
+            raise
+        for callback in callbacks['return']:
+            callback(func_def, result)
+        return result
+
+    # Apply a binary operator to two already evaluated operands.
+    def binary_op(self, op, l, r):
+        if op == '+':
+            # Normalize float values that are integers (e.g. 5.0 → 5)
+            if isinstance(l, float) and l.is_integer():
+                l = int(l)
+            if isinstance(r, float) and r.is_integer():
+                r = int(r)
+            # Concatenate as string if either operand is a string
+            if isinstance(l, str) or isinstance(r, str):
+                return self.memory.track(str(l) + str(r))
+            result = l + r
+            if type(result) is not list:
+                return result
+            if self.value_semantics:
+                # Items of both operands are now held by the new list too
+                result = CowList(result)
+                share_items(result)
+            return self.memory.track(result)
+        elif op == '-':
+            return l - r
+        elif op == '*':
+            return l * r
+        elif op == '/':
+            return l / r
+        elif op == '==':
+            return l == r
+        elif op == '!=':
+            return l != r
+        elif op == '<':
+            return l < r
+        elif op == '<=':
+            return l <= r
+        elif op == '>':
+            return l > r
+        elif op == '>=':
+            return l >= r
+
+    # Index a list, string or dictionary, normalizing integer floats (2.0 → 2).
+    def index_value(self, base, index):
+        if isinstance(index, float) and index.is_integer():
+            index = int(index)
+        return base[index]
+
     # Evaluate a block of statements. Creates a new environment if called from a function.
+    # A return only ends the function body, not the nested if/while block it appears in.
     def eval_block(self, block, env, is_function=False):
         result = None
         prev_env = self.env
-        self.env = Environment(parent=env) if is_function else env
+        if is_function:
+            self.env = Environment(parent=env)
+            if self.stats.enabled:
+                self.stats.environments += 1
+        else:
+            self.env = env
         try:
             for stmt in block.stmts:
                 result = self.eval(stmt)
         except ReturnException as ret:
+            if not is_function:
+                raise
             result = ret.value
         finally:
             self.env = prev_env
@@ -176,7 +385,34 @@ class Interpreter:
 
     # Call a user-defined function with arguments.
     def call_function(self, func_def, args):
+        # Parameters are new names for the arguments' values
+        if self.value_semantics:
+            for arg in args:
+                share(arg)
+        # Generator functions run lazily, as their result is iterated
+        if func_def.generator:
+            return Generator(self, func_def, args)
+        if self.jit:
+            compiled = self.jit.lookup(func_def, args)
+            if compiled:
+                # Compiled functions keep their own statistics
+                return compiled(self, self.env, args)
+        stats = self.stats
+        counted = stats.enabled
+        if counted:
+            stats.calls += 1
+            stats.environments += 1
+            stats.depth += 1
+            if stats.depth > stats.max_depth:
+                stats.max_depth = stats.depth
         local_env = Environment(parent=self.env)
         for param, arg in zip(func_def.params, args):
             local_env.set(param, arg)
-        return self.eval_block(func_def.body, local_env, is_function=True)
+        prev_function = self.current_function
+        self.current_function = func_def
+        try:
+            return self.eval_block(func_def.body, local_env, is_function=True)
+        finally:
+            self.current_function = prev_function
+            if counted:
+                stats.depth -= 1
@@ -0,0 +1,289 @@
+# Tiered JIT: counts calls and loop iterations per function and, once a
+# FuncDef is hot, translates its body into Python source that is compile()d
+# and run directly by CPython. Cold code stays in the tree-walking interpreter.
+import sys
+from Parser.Nodes import *
+from .Environment import Environment
+from .Builtins import BUILTINS
+from .Collections import Set
+
+# Calls plus loop iterations before a function is compiled
+THRESHOLD = 200
+
+
+# --- Runtime helpers shared by all generated code ---
+
+def _index(base, index):
+    if isinstance(index, float) and index.is_integer():
+        index = int(index)
+    return base[index]
+
+
+def _setitem(store, obj, index, value):
+    if isinstance(index, float) and index.is_integer():
+        index = int(index)
+    store(obj, index, value)
+    return value
+
+
+def _delitem(container, key):
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    del container[key]
+
+
+def _print(val, out):
+    if isinstance(val, float) and val.is_integer():
+        val = int(val)
+    print(val, file=out)
+
+
+# Operators whose Python meaning matches the interpreter exactly
+NATIVE_OPS = ('-', '*', '/', '==', '!=', '<', '<=', '>', '>=')
+
+
+# FunctionCompiler turns one FuncDef into the source of a Python function
+# taking the executing interpreter, the caller's environment and the argument
+# list. Compiled code holds no interpreter of its own, so one compiled
+# function serves every execution sharing the JIT, on any thread.
+#
+# Variables live in a real Environment so that functions called from compiled
+# code still see the caller's variables (scoping is dynamic). Parameters and
+# names assigned in the body are local; any other name is looked up in the
+# caller's environment chain, as the interpreter would. While compiled code
+# runs, the interpreter's current environment is the function's own, so
+# callees and the memory tracker see the same scope chain as when interpreted.
+class FunctionCompiler:
+    def __init__(self, func_def, stats=True):
+        self.func_def = func_def
+        # Whether the generated code keeps the call counters (see Stats.py)
+        self.stats = stats
+        self.lines = []
+        # AST nodes referenced from the generated code (nested FuncDefs)
+        self.constants = []
+        self.params = set(func_def.params)
+        self.assigned = set()
+        self.collect_assigned(func_def.body)
+
+    def collect_assigned(self, node):
+        if isinstance(node, Block):
+            for stmt in node.stmts:
+                self.collect_assigned(stmt)
+        elif isinstance(node, Assign):
+            self.assigned.add(node.name)
+        elif isinstance(node, If):
+            self.collect_assigned(node.then_)
+            if node.else_:
+                self.collect_assigned(node.else_)
+        elif isinstance(node, While):
+            self.collect_assigned(node.body)
+        elif isinstance(node, For):
+            self.assigned.add(node.var)
+            self.collect_assigned(node.body)
+
+    def compile(self):
+        name = self.func_def.name
+        self.emit(0, f"def _jit_{name}(_interp, _caller, _args):")
+        self.emit(1, "_e = _Environment(_caller)")
+        self.emit(1, "V = _e.vars")
+        self.emit(1, "_get = _caller.get")
+        self.emit(1, "_binop = _interp.binary_op")
+        self.emit(1, "_track = _interp.memory.track")
+        if self.stats:
+            self.emit(1, "_s = _interp.stats")
+            self.emit(1, "_s.calls += 1")
+            self.emit(1, "_s.environments += 1")
+            self.emit(1, "_s.depth += 1")
+            self.emit(1, "if _s.depth > _s.max_depth: _s.max_depth = _s.depth")
+        for i, param in enumerate(self.func_def.params):
+            self.emit(1, f"V[{param!r}] = _args[{i}]")
+        self.emit(1, "_interp.env = _e")
+        self.emit(1, "try:")
+        self.block(self.func_def.body.stmts, 2, tail=True)
+        self.emit(1, "finally:")
+        self.emit(2, "_interp.env = _caller")
+        if self.stats:
+            self.emit(2, "_s.depth -= 1")
+        return "\n".join(self.lines) + "\n"
+
+    def emit(self, depth, line):
+        self.lines.append("    " * depth + line)
+
+    # Statements in tail position produce the function's result: like
+    # eval_block, a body that does not return yields its last statement's value.
+    def block(self, stmts, depth, tail=False):
+        if not stmts:
+            self.emit(depth, "pass")
+            return
+        for i, stmt in enumerate(stmts):
+            self.stmt(stmt, depth, tail and i == len(stmts) - 1)
+
+    def stmt(self, node, depth, tail):
+        if isinstance(node, Assign):
+            self.emit(depth, f"_t = {self.expr(node.expr)}")
+            self.emit(depth, f"V[{node.name!r}] = _t")
+            if tail:
+                self.emit(depth, "return _t")
+
+        elif isinstance(node, Print):
+            self.emit(depth, f"_print({self.expr(node.expr)}, _interp.output)")
+
+        elif isinstance(node, If):
+            self.emit(depth, f"if {self.expr(node.cond)}:")
+            self.block(node.then_.stmts, depth + 1, tail)
+            if node.else_:
+                self.emit(depth, "else:")
+                self.block(node.else_.stmts, depth + 1, tail)
+
+        elif isinstance(node, While):
+            self.emit(depth, f"while {self.expr(node.cond)}:")
+            self.block(node.body.stmts, depth + 1)
+
+        elif isinstance(node, For):
+            self.emit(depth, f"for V[{node.var!r}] in {self.expr(node.iterable)}:")
+            self.block(node.body.stmts, depth + 1)
+
+        elif isinstance(node, Block):
+            self.block(node.stmts, depth, tail)
+
+        elif isinstance(node, Return):
+            self.emit(depth, f"return {self.expr(node.expr)}")
+
+        elif isinstance(node, FuncDef):
+            self.constants.append(node)
+            self.emit(depth, f"_interp.functions[{node.name!r}] = _K[{len(self.constants) - 1}]")
+
+        elif isinstance(node, Checkpoint):
+            self.emit(depth, "pass")
+
+        elif isinstance(node, Import):
+            self.emit(depth, f"_interp.modules.import_module({node.path!r})")
+
+        elif isinstance(node, IndexAssign):
+            call = f"_setitem(_interp.memory.store, {self.expr(node.obj)}, {self.expr(node.index)}, {self.expr(node.value)})"
+            self.emit(depth, f"return {call}" if tail else call)
+
+        elif isinstance(node, Remove):
+            self.emit(depth, f"_delitem({self.expr(node.obj)}, {self.expr(node.index)})")
+
+        else:
+            # Expression statement
+            code = self.expr(node)
+            self.emit(depth, f"return {code}" if tail else code)
+
+    def expr(self, node):
+        if isinstance(node, (Num, Str, Bool)):
+            return repr(node.val)
+
+        elif isinstance(node, Var):
+            name = node.name
+            if name in self.params:
+                return f"V[{name!r}]"
+            if name in self.assigned:
+                return f"(V[{name!r}] if {name!r} in V else _get({name!r}))"
+            return f"_get({name!r})"
+
+        elif isinstance(node, UnaryOp):
+            if node.op == '-':
+                return f"(-{self.expr(node.expr)})"
+            return f"(not {self.expr(node.expr)})"
+
+        elif isinstance(node, BinOp):
+            l, r = self.expr(node.l), self.expr(node.r)
+            if node.op == '+':
+                return f"_binop('+', {l}, {r})"
+            # Python's own and/or short-circuit exactly like the interpreter
+            if node.op in ('and', 'or'):
+                return f"({l} {node.op} {r})"
+            if node.op in NATIVE_OPS:
+                return f"({l} {node.op} {r})"
+
+        elif isinstance(node, CondExpr):
+            return f"({self.expr(node.then_)} if {self.expr(node.cond)} else {self.expr(node.else_)})"
+
+        elif isinstance(node, Input):
+            return f"_track(_interp.input.read(str({self.expr(node.prompt)})))"
+
+        elif isinstance(node, ListExpr):
+            return "_track([" + ", ".join(self.expr(x) for x in node.items) + "])"
+
+        elif isinstance(node, DictExpr):
+            return "_track({" + ", ".join(f"{self.expr(k)}: {self.expr(v)}" for k, v in node.pairs) + "})"
+
+        elif isinstance(node, SetExpr):
+            return "_track(_Set([" + ", ".join(self.expr(x) for x in node.items) + "]))"
+
+        elif isinstance(node, IndexExpr):
+            return f"_index({self.expr(node.base)}, {self.expr(node.index)})"
+
+        elif isinstance(node, Call):
+            args = ", ".join(self.expr(arg) for arg in node.args)
+            return f"_call(_interp, {node.func!r}, [{args}])"
+
+        raise NotImplementedError(f"JIT cannot compile {type(node).__name__}")
+
+
+# JIT keeps per-function hotness counters and the compiled code cache. It is
+# shared by interpreters spawned from the same one (see Interpreter.spawn).
+# Under concurrent use a function may occasionally be compiled twice, which
+# is harmless: both results are equivalent.
+class JIT:
+    def __init__(self, threshold=THRESHOLD, dump=False, stats=True):
+        self.threshold = threshold
+        self.stats = stats
+        # Print generated source to stderr as functions are compiled
+        self.dump = dump
+        self.hotness = {}
+        # FuncDef -> compiled function, or None if it could not be compiled
+        self.compiled = {}
+        self.sources = {}
+
+    # Count a call and return the compiled version of func_def once it is hot.
+    def lookup(self, func_def, args):
+        if func_def in self.compiled:
+            code = self.compiled[func_def]
+            # Missing arguments fall back to the caller's scope; leave that to the interpreter
+            return code if code and len(args) == len(func_def.params) else None
+        hotness = self.hotness.get(func_def, 0) + 1
+        self.hotness[func_def] = hotness
+        if hotness >= self.threshold:
+            self.compiled[func_def] = self.compile(func_def)
+        return None
+
+    def record_loop(self, func_def, iterations):
+        if func_def not in self.compiled:
+            self.hotness[func_def] = self.hotness.get(func_def, 0) + iterations
+
+    def compile(self, func_def):
+        compiler = FunctionCompiler(func_def, self.stats)
+        try:
+            source = compiler.compile()
+        except NotImplementedError:
+            return None
+        self.sources[func_def.name] = source
+        if self.dump:
+            print(f"# --- JIT: {func_def.name} ---\n{source}", file=sys.stderr)
+        namespace = {
+            '_Environment': Environment,
+            '_Set': Set,
+            '_K': compiler.constants,
+            '_call': self.call,
+            '_index': _index, '_setitem': _setitem, '_delitem': _delitem,
+            '_print': _print,
+        }
+        exec(compile(source, f"<jit {func_def.name}>", "exec"), namespace)
+        return namespace[f"_jit_{func_def.name}"]
+
+    # Call a function by name from compiled code.
+    def call(self, interp, name, args):
+        func = interp.functions.get(name)
+        if not func:
+            builtin = BUILTINS.get(name)
+            if not builtin:
+                raise RuntimeError(f"Function '{name}' not defined.")
+            return interp.memory.track(builtin(*args))
+        # Compiled callees are entered directly, skipping the interpreter
+        code = self.compiled.get(func)
+        if code and len(args) == len(func.params):
+            return code(interp, interp.env, args)
+        return interp.call_function(func, args)
@@ -0,0 +1,131 @@
+# MemoryTracker keeps an approximate count of the bytes held by script values.
+# Allocation sites (list/dict literals, '+' on strings and lists, ammend and
+# input) report the size of what they create. Once enough has been allocated
+# since the last check, the values reachable from the live environments are
+# measured and compared against the limit. The gap between checks grows with
+# the size of the last walk, so checking stays a small fraction of the work
+# done allocating.
+import sys
+from collections import deque
+from .Exceptions import MemoryLimitError
+from .Generators import Generator
+from .Collections import Heap
+
+# Values whose items the reachability walk descends into
+CONTAINERS = (list, dict, set, deque, Heap, Generator)
+
+# Minimum bytes allocated between two reachability checks
+CHECK_INTERVAL = 1 << 20
+# Bytes that must be allocated per value visited by the previous check
+BYTES_PER_VISIT = 1024
+
+
+class MemoryTracker:
+    def __init__(self, interpreter, limit=None):
+        self.interpreter = interpreter
+        self.limit = limit
+        # Live bytes at the most recent check, and the highest seen this run
+        self.current = 0
+        self.peak = 0
+        # Total bytes reported by allocation sites
+        self.allocated = 0
+        self.checks = 0
+        # Values visited by the most recent check
+        self.visited = 0
+        self.budget = self.next_budget()
+
+    # Report a newly created value; returns it so calls can wrap expressions.
+    def track(self, value):
+        self.allocate(sys.getsizeof(value), value)
+        return value
+
+    # Store value at container[index] (an ammend), reporting the value, the
+    # key when it is new to a dict or set, and however much the container
+    # itself grew to hold it.
+    def store(self, container, index, value):
+        before = sys.getsizeof(container)
+        size = sys.getsizeof(value)
+        if isinstance(container, (dict, set)) and index not in container:
+            size += sys.getsizeof(index)
+        container[index] = value
+        self.allocate(size + max(0, sys.getsizeof(container) - before), value)
+
+    def allocate(self, size, pending=None):
+        self.allocated += size
+        self.budget -= size
+        if self.budget <= 0:
+            self.check(pending)
+
+    def next_budget(self):
+        budget = max(CHECK_INTERVAL, self.visited * BYTES_PER_VISIT)
+        if self.limit is not None:
+            # Check again before the limit can be crossed; when the heap sits
+            # just under it, allow a bounded overshoot instead of constant checks
+            budget = min(budget, max(self.limit - self.current, self.limit // 4))
+        return budget
+
+    def check(self, pending=None):
+        self.checks += 1
+        self.usage(pending)
+        self.budget = self.next_budget()
+        if self.limit is not None and self.current > self.limit:
+            raise MemoryLimitError(
+                f"Memory limit exceeded: script values use {self.current} bytes "
+                f"(limit {self.limit})"
+            )
+
+    # Sum the sizes of all values reachable from the current scope chain
+    # (which includes every active caller's scope) plus a value in flight.
+    # Containers are walked once; leaf values shared between containers are
+    # counted each time they appear.
+    def measure(self, pending=None):
+        seen = set()
+        total = 0
+        visited = 0
+        stack = []
+        if pending is not None:
+            total += sys.getsizeof(pending)
+            stack.append(pending)
+        for env in [self.interpreter.env, *self.interpreter.outer_envs]:
+            while env is not None:
+                total += sys.getsizeof(env.vars)
+                stack.append(env.vars)
+                env = env.parent
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            if isinstance(obj, dict):
+                total += sum(map(sys.getsizeof, obj.keys()))
+                items = obj.values()
+            elif isinstance(obj, (list, set, deque)):
+                items = obj
+            elif isinstance(obj, Heap):
+                items = obj.items
+            elif isinstance(obj, Generator):
+                # A suspended generator keeps its local scope alive
+                stack.append(obj.env.vars)
+                continue
+            else:
+                continue
+            visited += len(obj)
+            total += sum(map(sys.getsizeof, items))
+            stack.extend(x for x in items if isinstance(x, CONTAINERS))
+        self.visited = visited
+        return total
+
+    # Measure the heap now, updating the peak.
+    def usage(self, pending=None):
+        self.current = self.measure(pending)
+        self.peak = max(self.peak, self.current)
+        return self.current
+
+    def stats(self):
+        return {
+            'current': self.current,
+            'peak': self.peak,
+            'allocated': self.allocated,
+            'checks': self.checks,
+            'limit': self.limit,
+        }
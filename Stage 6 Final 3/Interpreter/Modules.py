@@ -0,0 +1,170 @@
+# Module system: import "file.mylang"; loads a file of function definitions
+# and registers them as <module>.<function>, where <module> is the file name
+# without its extension. Parsed modules are cached for the whole process,
+# keyed by path and modification time, and on disk in a __mylangcache__
+# directory next to the source, checked against a hash of the source text.
+# Importing the same library from many programs therefore costs one parse.
+import hashlib
+import os
+import pickle
+import threading
+
+from Lexer.Lexer import Lexer
+from Parser.Parser import Parser
+from Parser.Nodes import Call, FuncDef, Import
+from Parser.Walk import walk
+
+CACHE_VERSION = 3
+CACHE_DIR = '__mylangcache__'
+
+# Absolute path -> Module, shared by every interpreter in the process
+_modules = {}
+
+# How each module load was satisfied, for checking that caching works
+cache_stats = {'memory': 0, 'disk': 0, 'parsed': 0}
+
+
+# A parsed module: its function definitions and the modules it imports
+class Module:
+    def __init__(self, path, stamp, source_hash, functions, imports):
+        self.version = CACHE_VERSION
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.stamp = stamp
+        self.source_hash = source_hash
+        self.functions = functions
+        self.imports = imports
+
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def source_hash(source):
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def cache_path(path):
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, CACHE_DIR, filename + '.pickle')
+
+
+# Lex and parse a module file, resolving its imports relative to its own
+# directory and qualifying calls between its own functions.
+def parse_module(path, stamp, source):
+    ast = Parser(Lexer(source).tokenize()).parse()
+    functions, imports = [], []
+    for stmt in ast.stmts:
+        if isinstance(stmt, FuncDef):
+            functions.append(stmt)
+        elif isinstance(stmt, Import):
+            imports.append(os.path.abspath(os.path.join(os.path.dirname(path), stmt.path)))
+        else:
+            raise RuntimeError(f"Module {path} may only define functions and import modules")
+
+    module = Module(path, stamp, source_hash(source), functions, imports)
+    own = {func.name for func in functions}
+    for func in functions:
+        for node in walk(func.body):
+            if isinstance(node, Call) and node.func in own:
+                node.func = f"{module.name}.{node.func}"
+    return module
+
+
+def read_cache(path, stamp):
+    try:
+        with open(cache_path(path), 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, AttributeError):
+        return None, None
+    if not isinstance(entry, Module) or entry.version != CACHE_VERSION:
+        return None, None
+    if entry.stamp == stamp:
+        return entry, None
+    # Touched but possibly unchanged: compare the source itself
+    with open(path) as f:
+        source = f.read()
+    if entry.source_hash == source_hash(source):
+        entry.stamp = stamp
+        write_cache(entry)
+        return entry, None
+    return None, source
+
+
+def write_cache(module):
+    target = cache_path(module.path)
+    try:
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Unique per thread too, as threads may load the same module at once
+        temp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp, 'wb') as f:
+            pickle.dump(module, f)
+        os.replace(temp, target)
+    except OSError:
+        # A read-only library directory just means no disk cache
+        pass
+
+
+# Return the parsed module at an absolute path, using the caches when valid.
+def load_module(path, disk_cache=True):
+    stamp = file_stamp(path)
+    module = _modules.get(path)
+    if module and module.stamp == stamp:
+        cache_stats['memory'] += 1
+        return module
+
+    source = None
+    if disk_cache:
+        module, source = read_cache(path, stamp)
+        if module:
+            cache_stats['disk'] += 1
+    if not module:
+        if source is None:
+            with open(path) as f:
+                source = f.read()
+        module = parse_module(path, stamp, source)
+        cache_stats['parsed'] += 1
+        if disk_cache:
+            write_cache(module)
+    _modules[path] = module
+    return module
+
+
+# ModuleLoader registers imported modules' functions into one interpreter.
+class ModuleLoader:
+    def __init__(self, interpreter, base_dir='.', disk_cache=True):
+        self.interpreter = interpreter
+        # Directory the main program's imports are relative to
+        self.base_dir = base_dir
+        self.disk_cache = disk_cache
+        # Module name -> path of every module registered so far
+        self.names = {}
+        # Modules currently being imported, outermost first
+        self.loading = []
+
+    def import_module(self, path):
+        path = os.path.abspath(os.path.join(self.base_dir, path))
+        if path in self.loading:
+            chain = self.loading[self.loading.index(path):] + [path]
+            raise RuntimeError("Circular import: " + " -> ".join(chain))
+        if path in self.names.values():
+            return
+        if not os.path.exists(path):
+            raise RuntimeError(f"Module not found: {path}")
+
+        module = load_module(path, self.disk_cache)
+        if module.name in self.names:
+            raise RuntimeError(
+                f"Module name '{module.name}' is already imported from {self.names[module.name]}"
+            )
+        self.loading.append(path)
+        try:
+            for dependency in module.imports:
+                self.import_module(dependency)
+        finally:
+            self.loading.pop()
+
+        for func in module.functions:
+            self.interpreter.functions[f"{module.name}.{func.name}"] = func
+        self.names[module.name] = path
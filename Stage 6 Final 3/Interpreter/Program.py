@@ -0,0 +1,96 @@
+# Embedding API. Program.prepare() lexes and parses a source once, hoists its
+# top-level function definitions and resolves its top-level imports into an
+# immutable function table. run() then executes the remaining statements as
+# often as needed, each time with fresh globals (optionally injected by the
+# caller), optionally capturing printed output, and returns what the program
+# produced. A top-level `return expr;` sets the run's value.
+#
+# Each run executes in its own interpreter spawned from the program's, so a
+# prepared program can be run from many threads at once. The statements and
+# function table are never modified; runs share JIT-compiled code.
+#
+#   program = Program.prepare(source)
+#   result = program.run({"order": order}, capture_output=True)
+#   result.value, result.output, result.globals, result.stats
+import io
+import os
+from types import MappingProxyType
+
+from Lexer.Lexer import Lexer
+from Parser.Parser import Parser
+from Parser.Nodes import FuncDef, Import
+from .CopyOnWrite import bound
+from .Interpreter import Interpreter
+from .Exceptions import ReturnException
+
+
+# RunResult is what one execution of a prepared program produced.
+class RunResult:
+    def __init__(self, value, output, globals, stats):
+        self.value = value
+        # Printed text when output was captured, otherwise None
+        self.output = output
+        self.globals = globals
+        # The run's RuntimeStats snapshot (see Stats.py)
+        self.stats = stats
+
+    def __repr__(self):
+        return f"RunResult(value={self.value!r}, output={self.output!r})"
+
+
+class Program:
+    def __init__(self, stmts, functions, interpreter):
+        self.stmts = tuple(stmts)
+        self.functions = MappingProxyType(dict(functions))
+        # Template every run is spawned from; holds the shared quickener and JIT
+        self.interpreter = interpreter
+
+    @classmethod
+    def prepare(cls, source, base_dir='.', **options):
+        # options are passed to the Interpreter (quicken, jit, memory_limit, ...)
+        ast = Parser(Lexer(source).tokenize()).parse()
+        names = [stmt.name for stmt in ast.stmts if isinstance(stmt, FuncDef)]
+
+        # Imports are resolved once, through the template interpreter's loader
+        loader = Interpreter(**options)
+        loader.modules.base_dir = base_dir
+        functions, stmts = {}, []
+        for stmt in ast.stmts:
+            # A name defined more than once at top level keeps its run-time order
+            if isinstance(stmt, FuncDef) and names.count(stmt.name) == 1:
+                functions[stmt.name] = stmt
+            elif isinstance(stmt, Import):
+                loader.modules.import_module(stmt.path)
+            else:
+                stmts.append(stmt)
+        functions = {**loader.functions, **functions}
+        return cls(stmts, functions, loader)
+
+    @classmethod
+    def prepare_file(cls, filename, **options):
+        with open(filename) as f:
+            source = f.read()
+        return cls.prepare(source, os.path.dirname(os.path.abspath(filename)), **options)
+
+    def run(self, globals=None, capture_output=False):
+        # The function table is copied so definitions made while running
+        # never leak into the prepared program or other runs
+        interp = self.interpreter.spawn()
+        interp.functions = dict(self.functions)
+        if globals:
+            if interp.value_semantics:
+                # The caller keeps its own references to these values
+                globals = {name: bound(value) for name, value in globals.items()}
+            interp.env.vars.update(globals)
+        if capture_output:
+            interp.output = io.StringIO()
+
+        value = None
+        with interp.stats.timed('eval'):
+            try:
+                for stmt in self.stmts:
+                    interp.eval(stmt)
+            except ReturnException as ret:
+                value = ret.value
+        output = interp.output.getvalue() if capture_output else None
+        return RunResult(value, output, dict(interp.env.vars), interp.stats.snapshot())
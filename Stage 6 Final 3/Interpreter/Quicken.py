@@ -0,0 +1,284 @@
+# Quickening: hot BinOp, IndexExpr and Var nodes are rewritten in place
+# (by swapping their class) into variants specialized for the operand types
+# observed at runtime. Every variant guards its assumption on each run and
+# de-specializes back to the generic node when the guard fails.
+import operator
+from Parser.Nodes import BinOp, IndexExpr, Var
+from .CopyOnWrite import CowDict, CowList
+
+# Generic evaluations of a node before it is considered hot
+WARMUP = 8
+# Generic evaluations to wait after a failed guard before retrying
+BACKOFF = 64
+
+NUMBER_TYPES = (int, float)
+# Copy-on-write containers index exactly like the plain ones
+LIST_TYPES = (list, CowList)
+DICT_TYPES = (dict, CowDict)
+
+ARITH_OPS = {'-': operator.sub, '*': operator.mul, '/': operator.truediv}
+
+COMPARE_OPS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge,
+}
+
+
+# --- Specialized BinOp variants ---
+
+class AddNumbers(BinOp):
+    kind = 'add number+number'
+
+    def run(self, interp):
+        l = interp.eval(self.l)
+        r = interp.eval(self.r)
+        if type(l) in NUMBER_TYPES and type(r) in NUMBER_TYPES:
+            self.hits += 1
+            # Same integer normalisation as the generic '+' branch
+            if type(l) is float and l.is_integer():
+                l = int(l)
+            if type(r) is float and r.is_integer():
+                r = int(r)
+            return l + r
+        despecialize(self, BinOp)
+        return interp.binary_op(self.op, l, r)
+
+
+class AddStrings(BinOp):
+    kind = 'add string+string'
+
+    def run(self, interp):
+        l = interp.eval(self.l)
+        r = interp.eval(self.r)
+        if type(l) is str and type(r) is str:
+            self.hits += 1
+            return interp.memory.track(l + r)
+        despecialize(self, BinOp)
+        return interp.binary_op(self.op, l, r)
+
+
+class ArithNumbers(BinOp):
+    kind = 'arith number-number'
+
+    def run(self, interp):
+        l = interp.eval(self.l)
+        r = interp.eval(self.r)
+        if type(l) in NUMBER_TYPES and type(r) in NUMBER_TYPES:
+            self.hits += 1
+            return self.fn(l, r)
+        despecialize(self, BinOp)
+        return interp.binary_op(self.op, l, r)
+
+
+class CompareNumbers(BinOp):
+    kind = 'compare number-number'
+
+    def run(self, interp):
+        l = interp.eval(self.l)
+        r = interp.eval(self.r)
+        if type(l) in NUMBER_TYPES and type(r) in NUMBER_TYPES:
+            self.hits += 1
+            return self.fn(l, r)
+        despecialize(self, BinOp)
+        return interp.binary_op(self.op, l, r)
+
+
+# --- Specialized IndexExpr variants ---
+
+class IndexListByInt(IndexExpr):
+    kind = 'index list[int]'
+
+    def run(self, interp):
+        base = interp.eval(self.base)
+        index = interp.eval(self.index)
+        if type(base) in LIST_TYPES:
+            if type(index) is int:
+                self.hits += 1
+                return base[index]
+            if type(index) is float and index.is_integer():
+                self.hits += 1
+                return base[int(index)]
+        despecialize(self, IndexExpr)
+        return interp.index_value(base, index)
+
+
+class IndexDictByStr(IndexExpr):
+    kind = 'index dict[str]'
+
+    def run(self, interp):
+        base = interp.eval(self.base)
+        index = interp.eval(self.index)
+        if type(base) in DICT_TYPES and type(index) is str:
+            self.hits += 1
+            return base[index]
+        despecialize(self, IndexExpr)
+        return interp.index_value(base, index)
+
+
+# --- Specialized Var variants ---
+
+class LocalVar(Var):
+    kind = 'var in current scope'
+
+    def run(self, interp):
+        vars = interp.env.vars
+        if self.name in vars:
+            self.hits += 1
+            return vars[self.name]
+        despecialize(self, Var)
+        return interp.env.get(self.name)
+
+
+class ParentVar(Var):
+    kind = 'var in parent scope'
+
+    def run(self, interp):
+        env = interp.env
+        parent = env.parent
+        if parent is not None and self.name not in env.vars and self.name in parent.vars:
+            self.hits += 1
+            return parent.vars[self.name]
+        despecialize(self, Var)
+        return env.get(self.name)
+
+
+# Swap a specialized node back to its generic class after a failed guard.
+# Nodes can be shared between interpreters (cached modules, snapshots,
+# prepared programs), so this must work from one that does not quicken: the
+# counters belong to the quickener that specialized the node.
+def despecialize(node, generic):
+    quickener = node.__dict__.pop('quickener', None)
+    if quickener is not None:
+        quickener.retire(node)
+    node.__class__ = generic
+    node.warm = -BACKOFF
+
+
+# Classes the interpreter dispatches to directly through their run() method
+QUICKENED = frozenset({
+    AddNumbers, AddStrings, ArithNumbers, CompareNumbers,
+    IndexListByInt, IndexDictByStr, LocalVar, ParentVar,
+})
+
+# The generic class and attributes of a specialized node. Snapshots save
+# nodes this way, so a restoring interpreter that does not quicken (or
+# quickens differently) starts from generic nodes, as after parsing.
+def generic_state(node):
+    state = {k: v for k, v in vars(node).items() if k not in ('hits', 'quickener', 'fn', 'warm')}
+    return type(node).__bases__[0], state
+
+
+KINDS = [cls.kind for cls in (
+    AddNumbers, AddStrings, ArithNumbers, CompareNumbers,
+    IndexListByInt, IndexDictByStr, LocalVar, ParentVar,
+)]
+
+
+# Quickener observes generic evaluations, rewrites hot nodes and keeps the
+# counters used to report specialization hit rates.
+class Quickener:
+    def __init__(self):
+        # Nodes currently running as a specialized variant
+        self.nodes = set()
+        self.specializations = dict.fromkeys(KINDS, 0)
+        self.deopts = dict.fromkeys(KINDS, 0)
+        # Hits collected from nodes that have since been de-specialized
+        self.retired_hits = dict.fromkeys(KINDS, 0)
+
+    def is_hot(self, node):
+        # Count a generic evaluation; negative counts are a backoff period
+        count = node.__dict__.get('warm', 0) + 1
+        node.warm = count
+        return count >= WARMUP
+
+    def observe_binop(self, node, l, r):
+        if not self.is_hot(node):
+            return
+        tl, tr = type(l), type(r)
+        cls = None
+        if tl in NUMBER_TYPES and tr in NUMBER_TYPES:
+            if node.op == '+':
+                cls = AddNumbers
+            elif node.op in ARITH_OPS:
+                cls = ArithNumbers
+                node.fn = ARITH_OPS[node.op]
+            elif node.op in COMPARE_OPS:
+                cls = CompareNumbers
+                node.fn = COMPARE_OPS[node.op]
+        elif tl is str and tr is str and node.op == '+':
+            cls = AddStrings
+        self.specialize(node, cls)
+
+    def observe_index(self, node, base, index):
+        if not self.is_hot(node):
+            return
+        cls = None
+        if type(base) in LIST_TYPES and type(index) in NUMBER_TYPES:
+            cls = IndexListByInt
+        elif type(base) in DICT_TYPES and type(index) is str:
+            cls = IndexDictByStr
+        self.specialize(node, cls)
+
+    def observe_var(self, node, env):
+        if not self.is_hot(node):
+            return
+        cls = None
+        if node.name in env.vars:
+            cls = LocalVar
+        elif env.parent is not None and node.name in env.parent.vars:
+            cls = ParentVar
+        self.specialize(node, cls)
+
+    def specialize(self, node, cls):
+        if cls is None:
+            # Nothing fits these operands; stay generic for a while
+            node.warm = -BACKOFF
+            return
+        # Everything the variant reads is in place before its class is: on a
+        # free-threaded build another thread may run the node right away
+        # (fn, where needed, was set by the observe_* method)
+        node.hits = 0
+        # The specializing quickener keeps the counters for this node
+        node.quickener = self
+        node.__class__ = cls
+        # The swapped class no longer matches the instance's attribute
+        # layout, which sends every attribute access down CPython's slow
+        # path; a fresh dict restores the fast one. A concurrent run in
+        # between can at most lose a hit count.
+        node.__dict__ = dict(node.__dict__)
+        self.nodes.add(node)
+        self.specializations[cls.kind] += 1
+
+    # Account for a node returning to its generic class
+    def retire(self, node):
+        kind = node.kind
+        self.retired_hits[kind] += node.hits
+        self.deopts[kind] += 1
+        self.nodes.discard(node)
+
+    def stats(self):
+        # Aggregate counters per specialization kind
+        hits = dict(self.retired_hits)
+        # Copy first: other threads may be specializing nodes meanwhile
+        for node in list(self.nodes):
+            hits[node.kind] += node.hits
+        result = {}
+        for kind in KINDS:
+            total = hits[kind] + self.deopts[kind]
+            result[kind] = {
+                'specializations': self.specializations[kind],
+                'hits': hits[kind],
+                'deopts': self.deopts[kind],
+                'hit_rate': hits[kind] / total if total else 0.0,
+            }
+        return result
+
+    def report(self):
+        lines = [f"{'specialization':<24}{'rewrites':>10}{'hits':>12}{'deopts':>10}{'hit rate':>10}"]
+        for kind, s in self.stats().items():
+            lines.append(
+                f"{kind:<24}{s['specializations']:>10}{s['hits']:>12}"
+                f"{s['deopts']:>10}{s['hit_rate']:>10.1%}"
+            )
+        return "\n".join(lines)
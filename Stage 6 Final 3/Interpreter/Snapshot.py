@@ -0,0 +1,106 @@
+# Interpreter snapshots. A program marks the end of its initialization with a
+# top-level `checkpoint;` statement. Run with a snapshot file, the program's
+# state at that point (global variables, function table, imported modules and
+# the statements still to run) is saved; later runs of the same source load
+# it and continue from the checkpoint without lexing, parsing or repeating
+# the initialization. A snapshot is rejected, and rebuilt, when its format
+# version differs or the program or any imported module has changed.
+import os
+import pickle
+import sys
+
+from Parser.Nodes import Block, Checkpoint
+from .CopyOnWrite import bound
+from .Modules import source_hash
+from .Quicken import QUICKENED, generic_state
+
+SNAPSHOT_VERSION = 4
+
+
+class Snapshot:
+    def __init__(self, program_hash, modules, globals, functions, remaining):
+        self.version = SNAPSHOT_VERSION
+        self.program_hash = program_hash
+        # Module path -> hash of its source when the snapshot was taken
+        self.modules = modules
+        self.globals = globals
+        self.functions = functions
+        self.remaining = remaining
+
+
+def file_hash(path):
+    try:
+        with open(path) as f:
+            return source_hash(f.read())
+    except OSError:
+        return None
+
+
+# Return the snapshot at path if it is valid for this source, else None.
+def load_snapshot(path, source):
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(snapshot, Snapshot) or snapshot.version != SNAPSHOT_VERSION:
+        return None
+    if snapshot.program_hash != source_hash(source):
+        return None
+    for module_path, module_hash in snapshot.modules.items():
+        if file_hash(module_path) != module_hash:
+            return None
+    return snapshot
+
+
+# Saves quickened nodes as their generic class, without the counters and
+# the quickener that specialized them
+class SnapshotPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if type(obj) in QUICKENED:
+            cls, state = generic_state(obj)
+            return object.__new__, (cls,), state
+        return NotImplemented
+
+
+def save_snapshot(path, interpreter, source, remaining):
+    modules = {p: file_hash(p) for p in interpreter.modules.names.values()}
+    snapshot = Snapshot(source_hash(source), modules, interpreter.env.vars,
+                        interpreter.functions, remaining)
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp, 'wb') as f:
+            SnapshotPickler(f).dump(snapshot)
+        os.replace(temp, path)
+    except (OSError, pickle.PicklingError, TypeError) as e:
+        # e.g. a global holding an open file iterator; the run itself goes on
+        if os.path.exists(temp):
+            os.remove(temp)
+        print(f"⚠️ Could not write snapshot {path}: {e}", file=sys.stderr)
+
+
+# Run a parsed program, resuming from a valid snapshot or writing one when
+# the top-level checkpoint is reached. Programs without a checkpoint just run.
+def run_with_snapshot(interpreter, source, parse, path):
+    snapshot = load_snapshot(path, source)
+    if snapshot:
+        globals = snapshot.globals
+        if interpreter.value_semantics:
+            # The snapshot may have been taken without value semantics
+            globals = {name: bound(value) for name, value in globals.items()}
+        interpreter.env.vars.update(globals)
+        interpreter.functions.update(snapshot.functions)
+        for module_path in snapshot.modules:
+            name = os.path.splitext(os.path.basename(module_path))[0]
+            interpreter.modules.names[name] = module_path
+        return interpreter.eval(Block(snapshot.remaining))
+
+    ast = parse()
+    marks = [i for i, stmt in enumerate(ast.stmts) if isinstance(stmt, Checkpoint)]
+    if not marks:
+        return interpreter.eval(ast)
+    split = marks[0]
+    interpreter.eval(Block(ast.stmts[:split]))
+    remaining = ast.stmts[split + 1:]
+    save_snapshot(path, interpreter, source, remaining)
+    return interpreter.eval(Block(remaining))
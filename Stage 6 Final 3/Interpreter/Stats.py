@@ -0,0 +1,83 @@
+# Runtime statistics. Every interpreter keeps these counters while it runs;
+# they are plain integer increments on paths that already do far more work,
+# so they stay on in production. Interpreter(stats=False) turns the call
+# counters off, to measure what they cost (`python Benchmark.py stats`). The
+# results can be read with snapshot() or written as JSON or in the Prometheus
+# text exposition format, for aggregating batch runs.
+import json
+import time
+from contextlib import contextmanager
+
+PROMETHEUS_PREFIX = 'mylang'
+
+
+class RuntimeStats:
+    def __init__(self, interpreter, enabled=True):
+        self.interpreter = interpreter
+        # Whether calls, scopes and depth are counted. The node count is kept
+        # either way: checking a flag on every node would cost as much.
+        self.enabled = enabled
+        # User-defined function calls, interpreted or compiled
+        self.calls = 0
+        # Scopes created for function calls and generators
+        self.environments = 0
+        # Current and deepest nesting of user-defined function calls
+        self.depth = 0
+        self.max_depth = 0
+        # Phase name (lex, parse, eval, ...) -> seconds spent
+        self.phases = {}
+
+    # Nodes evaluated by the tree-walking evaluator (compiled code excluded).
+    # Counted on the interpreter itself, the cheapest place on the hottest path.
+    @property
+    def nodes(self):
+        return self.interpreter.evaluated
+
+    # Time a block of work as a phase; repeated phases add up.
+    @contextmanager
+    def timed(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - start
+
+    def snapshot(self):
+        return {
+            'nodes_evaluated': self.nodes,
+            'function_calls': self.calls,
+            'environments_created': self.environments,
+            'max_call_depth': self.max_depth,
+            'phase_seconds': dict(self.phases),
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, labels=None):
+        # labels (e.g. {"script": "job.mylang"}) are added to every sample
+        base = ",".join(f'{key}="{escape(value)}"' for key, value in (labels or {}).items())
+
+        def sample(name, value, extra=""):
+            inner = ",".join(part for part in (base, extra) if part)
+            return f"{PROMETHEUS_PREFIX}_{name}{{{inner}}} {value}" if inner else f"{PROMETHEUS_PREFIX}_{name} {value}"
+
+        lines = []
+        for name, kind, help, value in (
+            ('nodes_evaluated_total', 'counter', 'AST nodes evaluated by the interpreter', self.nodes),
+            ('function_calls_total', 'counter', 'User-defined function calls', self.calls),
+            ('environments_created_total', 'counter', 'Variable scopes created', self.environments),
+            ('max_call_depth', 'gauge', 'Deepest nesting of function calls', self.max_depth),
+        ):
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {kind}")
+            lines.append(sample(name, value))
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}_phase_seconds Time spent per phase")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_phase_seconds gauge")
+        for phase, seconds in self.phases.items():
+            lines.append(sample('phase_seconds', f"{seconds:.6f}", f'phase="{escape(phase)}"'))
+        return "\n".join(lines) + "\n"
+
+
+def escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -4,18 +4,23 @@ from .Token import Token
 
 # Lexer converts source code into a list of tokens.
 class Lexer:
-    def __init__(self, text):
+    def __init__(self, text, line=1):
         self.text = text
+        # Line number of the start of text (for chunks of a larger source)
+        self.line = line
 
     def tokenize(self):
         # Reserved keywords in the language
         keywords = {
             'if': 'IF', 'else': 'ELSE', 'while': 'WHILE',
+            'for': 'FOR', 'in': 'IN',
             'true': 'TRUE', 'false': 'FALSE',
             'print': 'PRINT', 'input': 'INPUT',
             'function': 'FUNCTION', 'return': 'RETURN',
             'define': 'DEFINEKW', 'ammend': 'AMMENDKW', 
-            'to': 'TOKW', 'remove': 'REMOVEKW'
+            'to': 'TOKW', 'remove': 'REMOVEKW',
+            'import': 'IMPORT', 'checkpoint': 'CHECKPOINT',
+            'yield': 'YIELD', 'and': 'AND', 'or': 'OR'
         }
 
         # Regular expression patterns for different token types
@@ -33,8 +38,9 @@ class Lexer:
             ('LBRACE',     r'\{'), ('RBRACE',     r'\}'),
             ('LBRACKET',   r'\['), ('RBRACKET',   r'\]'),
             ('COLON',      r':'),  ('COMMA',      r','), 
+            ('QUESTION',   r'\?'),
+            ('DOT',        r'\.'),
             ('SEMICOLON',  r';'),
-            ('AND',        r'and'), ('OR',         r'or'),
             ('NOT',        r'!'),
             ('COMMENT',    r'#.*'),
             ('SKIP',       r'[ \t\n]+'),
@@ -44,14 +50,16 @@ class Lexer:
         # Compile all patterns into a single regular expression
         regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_spec)
         tokens = []
+        line = self.line
 
         # Scan through the source text to find all token matches
         for match in re.finditer(regex, self.text):
             kind = match.lastgroup
             value = match.group()
 
-            # Ignore whitespace and comments
+            # Ignore whitespace and comments, counting lines as we go
             if kind in ('SKIP', 'COMMENT'):
+                line += value.count('\n')
                 continue
 
             # Raise error on unexpected character
@@ -60,24 +68,25 @@ class Lexer:
 
             # Strip quotes from string literals
             elif kind == 'STRING':
-                tokens.append(Token('STRING', value[1:-1]))
+                tokens.append(Token('STRING', value[1:-1], line))
+                line += value.count('\n')
 
             # Convert numeric literals to float
             elif kind == 'NUMBER':
-                tokens.append(Token('NUMBER', float(value)))
+                tokens.append(Token('NUMBER', float(value), line))
 
             # Resolve identifiers: keyword or variable name
             elif kind == 'IDENT':
                 tok_type = keywords.get(value, 'IDENT')
                 if tok_type == 'TRUE':
-                    tokens.append(Token('BOOLEAN', True))
+                    tokens.append(Token('BOOLEAN', True, line))
                 elif tok_type == 'FALSE':
-                    tokens.append(Token('BOOLEAN', False))
+                    tokens.append(Token('BOOLEAN', False, line))
                 else:
-                    tokens.append(Token(tok_type, value))
+                    tokens.append(Token(tok_type, value, line))
 
             # Append other matched tokens
             else:
-                tokens.append(Token(kind, value))
+                tokens.append(Token(kind, value, line))
 
         return tokens
@@ -1,8 +1,9 @@
-# Token class represents a single token with a type and value
+# Token class represents a single token with a type, value and source line
 class Token:
-    def __init__(self, type_, value):
+    def __init__(self, type_, value, line=None):
         self.type = type_
         self.value = value
+        self.line = line
 
     def __repr__(self):
         return f"Token({self.type}, {repr(self.value)})"
@@ -1,18 +1,164 @@
+import argparse
 import os
 import sys
+import time
 
 # Import modular components
 from Lexer.Lexer import Lexer
 from Parser.Parser import Parser
+from Parser.Parallel import parse_parallel
+from Parser.Incremental import IncrementalParser
+from Parser.Inline import INLINE_SIZE, Inliner
 from Interpreter.Interpreter import Interpreter
+from Interpreter.JIT import THRESHOLD
+from Interpreter.Exceptions import MemoryLimitError
+from Interpreter.Coverage import Coverage
+from Interpreter.CallTracer import CallTracer
+from Interpreter.Snapshot import run_with_snapshot
+from Interpreter.InputSource import BulkInput, RecordingInput, ReplayInput
+
+# Parse a byte count with an optional K/M/G suffix (e.g. 512M)
+def parse_size(text):
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    text = text.strip().upper()
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+# Seconds between checks of a watched file for changes
+WATCH_INTERVAL = 0.2
+
+# Build an interpreter configured from the command line options
+def create_interpreter(args, filename):
+    interpreter = Interpreter(quicken=not args.no_quicken, jit=not args.no_jit,
+                              jit_threshold=args.jit_threshold, jit_dump=args.jit_dump,
+                              memory_limit=args.memory_limit, value_semantics=args.value_semantics,
+                              stats=not args.no_stats)
+    # Imports in the program are relative to the program's own directory
+    interpreter.modules.base_dir = os.path.dirname(os.path.abspath(filename))
+    interpreter.modules.disk_cache = not args.no_module_cache
+    if args.replay_input:
+        interpreter.input = ReplayInput(args.replay_input)
+    elif args.bulk_input:
+        interpreter.input = BulkInput()
+    if args.record_input:
+        interpreter.input = RecordingInput(args.record_input, interpreter.input)
+    return interpreter
+
+# Write the interpreter's runtime statistics in the requested format, to a
+# file or to stderr.
+def write_stats(interpreter, args, filename):
+    if args.stats == "prometheus":
+        text = interpreter.stats.to_prometheus({"script": os.path.basename(filename)})
+    else:
+        text = interpreter.stats.to_json() + "\n"
+    if args.stats_file:
+        with open(args.stats_file, "w") as f:
+            f.write(text)
+    else:
+        sys.stderr.write(text)
+
+# Re-run the program every time its file is saved. Only the top-level
+# statements that changed are parsed again (see Parser/Incremental.py), and
+# each run reports how long the re-parse took before execution started.
+def watch(filename, args):
+    parser = IncrementalParser()
+    stamp = None
+    print(f"👀 Watching {filename} (Ctrl+C to stop)", file=sys.stderr)
+    try:
+        while True:
+            current = os.stat(filename).st_mtime_ns
+            if current != stamp:
+                stamp = current
+                with open(filename) as f:
+                    source_code = f.read()
+                start = time.perf_counter()
+                try:
+                    ast = parser.parse(source_code)
+                    if args.inline:
+                        ast = Inliner(args.inline_size, args.value_semantics).run(ast)
+                    parsed = time.perf_counter()
+                    print(f"↻ parsed {parser.parsed} statement(s), reused {parser.reused} "
+                          f"in {(parsed - start) * 1000:.1f} ms", file=sys.stderr)
+                    interpreter = create_interpreter(args, filename)
+                    interpreter.stats.phases['parse'] = parsed - start
+                    try:
+                        with interpreter.stats.timed('eval'):
+                            interpreter.eval(ast)
+                    finally:
+                        interpreter.input.close()
+                    if args.stats:
+                        write_stats(interpreter, args, filename)
+                    print(f"✓ ran in {(time.perf_counter() - parsed) * 1000:.1f} ms", file=sys.stderr)
+                except Exception as e:
+                    # Keep watching: the next save may fix it
+                    print(f"❌ {type(e).__name__}: {e}")
+            time.sleep(WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        pass
 
 def main():
     # Check for correct number of arguments
-    if len(sys.argv) != 2:
+    if len(sys.argv) < 2:
         print("Usage: python main.py <filename>.mylang")
         return
 
-    filename = sys.argv[1]
+    arg_parser = argparse.ArgumentParser(prog="main.py")
+    arg_parser.add_argument("filename")
+    arg_parser.add_argument("--no-quicken", action="store_true",
+                            help="disable type-specializing node rewrites")
+    arg_parser.add_argument("--quicken-stats", action="store_true",
+                            help="print specialization hit rates after the run")
+    arg_parser.add_argument("--no-jit", action="store_true",
+                            help="interpret every function, never compile")
+    arg_parser.add_argument("--jit-threshold", type=int, default=THRESHOLD,
+                            help="calls plus loop iterations before a function is compiled")
+    arg_parser.add_argument("--jit-dump", action="store_true",
+                            help="print the Python code generated for hot functions")
+    arg_parser.add_argument("--memory-limit", type=parse_size, default=None,
+                            help="stop the script once its values exceed this many bytes (e.g. 512M)")
+    arg_parser.add_argument("--memory-stats", action="store_true",
+                            help="print current and peak memory held by script values after the run")
+    arg_parser.add_argument("--no-module-cache", action="store_true",
+                            help="do not read or write parsed modules in __mylangcache__ directories")
+    arg_parser.add_argument("--coverage", action="store_true",
+                            help="report which statement lines ran")
+    arg_parser.add_argument("--trace-calls", action="store_true",
+                            help="print every function call and return to stderr")
+    arg_parser.add_argument("--inline", action="store_true",
+                            help="replace calls to small non-recursive functions with their bodies")
+    arg_parser.add_argument("--inline-size", type=int, default=INLINE_SIZE, metavar="N",
+                            help="largest function body, in AST nodes, that --inline copies")
+    arg_parser.add_argument("--inline-report", action="store_true",
+                            help="print which functions were inlined after the run")
+    arg_parser.add_argument("--value-semantics", action="store_true",
+                            help="copy lists and dicts on write so assignment and calls never alias them")
+    arg_parser.add_argument("--snapshot", metavar="FILE",
+                            help="resume from FILE after the program's checkpoint, or write it there")
+    arg_parser.add_argument("--parse-workers", type=int, default=0, metavar="N",
+                            help="lex and parse large sources in N processes (0: serially)")
+    input_mode = arg_parser.add_mutually_exclusive_group()
+    input_mode.add_argument("--replay-input", metavar="FILE",
+                            help="answer input() from a recording instead of the terminal")
+    input_mode.add_argument("--bulk-input", action="store_true",
+                            help="read all of stdin before running; each input() takes the next line")
+    arg_parser.add_argument("--record-input", metavar="FILE",
+                            help="record every input() prompt and response to FILE")
+    arg_parser.add_argument("--stats", choices=("json", "prometheus"),
+                            help="write runtime statistics (counters and phase times) at exit")
+    arg_parser.add_argument("--stats-file", metavar="FILE",
+                            help="write --stats output to FILE instead of stderr")
+    arg_parser.add_argument("--no-stats", action="store_true",
+                            help="do not count function calls, scopes and call depth")
+    arg_parser.add_argument("--watch", action="store_true",
+                            help="re-run whenever the file changes, re-parsing only edited statements")
+    args = arg_parser.parse_args()
+    if args.record_input and args.replay_input:
+        arg_parser.error("--record-input cannot be combined with --replay-input")
+    if args.stats and args.no_stats:
+        arg_parser.error("--stats cannot be combined with --no-stats")
+
+    filename = args.filename
 
     # Ensure the file has the correct .mylang extension
     if not filename.endswith(".mylang"):
@@ -24,21 +170,76 @@ def main():
         print(f"❌ File not found: {filename}")
         return
 
+    if args.watch:
+        watch(filename, args)
+        return
+
     # Step 1: Read source code
     with open(filename) as f:
         source_code = f.read()
 
-    # Step 2: Lexical Analysis (tokenize the source)
-    lexer = Lexer(source_code)
-    tokens = lexer.tokenize()
+    # The interpreter exists before parsing so it can time every phase
+    interpreter = create_interpreter(args, filename)
+    stats = interpreter.stats
+    inliner = Inliner(args.inline_size, args.value_semantics) if args.inline else None
+
+    def parse_program():
+        # Steps 2 and 3 split across worker processes
+        if args.parse_workers:
+            with stats.timed('parse'):
+                ast = parse_parallel(source_code, args.parse_workers)
+        else:
+            # Step 2: Lexical Analysis (tokenize the source)
+            with stats.timed('lex'):
+                lexer = Lexer(source_code)
+                tokens = lexer.tokenize()
+
+            #  Step 3: Parsing (generate abstract syntax tree from tokens)
+            with stats.timed('parse'):
+                parser = Parser(tokens)
+                ast = parser.parse()
+
+        # Optional: copy small functions into their call sites
+        if inliner:
+            with stats.timed('inline'):
+                ast = inliner.run(ast)
+        return ast
 
-    #  Step 3: Parsing (generate abstract syntax tree from tokens)
-    parser = Parser(tokens)
-    ast = parser.parse()
+    # A valid snapshot makes Steps 2 and 3 unnecessary
+    ast = None if args.snapshot else parse_program()
 
     # Step 4: Interpretation (execute the AST)
-    interpreter = Interpreter()
-    interpreter.eval(ast)
+    coverage = Coverage() if args.coverage else None
+    if coverage:
+        interpreter.hooks.install(coverage)
+    if args.trace_calls:
+        interpreter.hooks.install(CallTracer())
+    try:
+        if args.snapshot:
+            # Includes lexing and parsing when the snapshot has to be rebuilt
+            with stats.timed('eval'):
+                run_with_snapshot(interpreter, source_code, parse_program, args.snapshot)
+        else:
+            with stats.timed('eval'):
+                interpreter.eval(ast)
+    except MemoryLimitError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        interpreter.input.close()
+        if args.inline_report and inliner:
+            print(inliner.report(), file=sys.stderr)
+        if args.quicken_stats and interpreter.quickener:
+            print(interpreter.quickener.report(), file=sys.stderr)
+        if coverage:
+            print(coverage.report(ast or parse_program()), file=sys.stderr)
+        if args.memory_stats:
+            interpreter.memory.usage()
+            memory = interpreter.memory.stats()
+            print(f"memory: current {memory['current']} bytes, peak {memory['peak']} bytes, "
+                  f"allocated {memory['allocated']} bytes, {memory['checks']} checks", file=sys.stderr)
+        if args.stats:
+            write_stats(interpreter, args, filename)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,152 @@
+# Incremental re-parsing for watch mode. The source is kept as a list of
+# top-level statement chunks (see Parallel.statement_ends), each with its
+# parsed statements. On a new version of the source, the common prefix and
+# suffix with the previous version are found by comparing text; only the
+# chunks overlapping the changed span are lexed and parsed again. Chunks
+# before it are reused as they are, and chunks after it are reused with their
+# offsets and line numbers moved. A localized edit therefore costs a parse of
+# the edited statement plus a few cheap passes over the chunk list, not a
+# parse of the whole file. An edit that unbalances brackets falls back to
+# parsing every chunk.
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from Parser.Nodes import Block
+from Parser.Parallel import END, parse_chunk, statement_ends
+from Parser.Walk import walk
+
+
+# A top-level statement chunk's parsed statements
+class Chunk:
+    def __init__(self, stmts):
+        self.stmts = stmts
+        # Nodes carrying a line number, for moving the chunk cheaply
+        self.lined = [node for stmt in stmts for node in walk(stmt) if 'line' in node.__dict__]
+
+    def shift(self, lines):
+        for node in self.lined:
+            node.line += lines
+
+
+# Length of the longest common prefix (or, reversed, suffix) of a and b,
+# found by comparing ever smaller slices rather than character by character.
+def common_prefix(a, b):
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def common_suffix(a, b, limit):
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+# IncrementalParser keeps, for the last source it parsed, one Chunk per
+# top-level statement together with each chunk's length, newline count and
+# number of statements.
+# Offsets and line numbers are derived from those two lists, so chunks after
+# an edit only need touching when the edit changed the number of lines.
+class IncrementalParser:
+    def __init__(self):
+        self.source = None
+        self.chunks = []
+        self.lengths = []
+        self.newlines = []
+        # Every chunk's statements in order, and how many each chunk has
+        self.stmts = []
+        self.counts = []
+        # Chunks reused and parsed by the last parse()
+        self.reused = 0
+        self.parsed = 0
+
+    def parse(self, source):
+        if self.source is None or not self.chunks:
+            self.replace(0, len(self.chunks), self.parse_span(source, 0, len(source), 1, whole=True))
+            self.reused = 0
+        else:
+            self.reparse(source)
+        self.source = source
+        # A copy, since later edits splice self.stmts
+        return Block(list(self.stmts))
+
+    def reparse(self, source):
+        old = self.source
+        if source == old:
+            self.reused, self.parsed = len(self.chunks), 0
+            return
+        prefix = common_prefix(old, source)
+        suffix = common_suffix(old, source, min(len(old), len(source)) - prefix)
+
+        # Chunks from the one holding the first changed character to the one
+        # holding the last. The chunk before is included when it ends with a
+        # '}', since the change may continue it (e.g. an added else).
+        ends = list(accumulate(self.lengths))
+        count = len(self.chunks)
+        first = min(bisect_right(ends, prefix), count - 1)
+        if first > 0 and old[ends[first - 1] - 1] == '}':
+            first -= 1
+        last = min(max(bisect_left(ends, len(old) - suffix), first), count - 1)
+
+        start = ends[first - 1] if first else 0
+        old_end = ends[last]
+        new_end = old_end + len(source) - len(old)
+        line = 1 + sum(self.newlines[:first])
+        edited = self.parse_span(source, start, new_end, line, whole=new_end == len(source))
+        if edited is None:
+            # Brackets no longer balance within the span
+            self.replace(0, count, self.parse_span(source, 0, len(source), 1, whole=True))
+            self.reused = 0
+            return
+
+        lines = source.count('\n', start, new_end) - old.count('\n', start, old_end)
+        if lines:
+            for chunk in self.chunks[last + 1:]:
+                chunk.shift(lines)
+        self.replace(first, last + 1, edited)
+        self.reused = count - (last - first + 1)
+
+    # Replace chunks[first:last] with new (chunk, length, newlines) entries.
+    # Only called once parsing succeeded, so a broken edit leaves the state of
+    # the last good version to diff against when it is fixed.
+    def replace(self, first, last, entries):
+        begin = sum(self.counts[:first])
+        self.stmts[begin:begin + sum(self.counts[first:last])] = [
+            stmt for entry in entries for stmt in entry[0].stmts
+        ]
+        self.counts[first:last] = [len(entry[0].stmts) for entry in entries]
+        self.chunks[first:last] = [entry[0] for entry in entries]
+        self.lengths[first:last] = [entry[1] for entry in entries]
+        self.newlines[first:last] = [entry[2] for entry in entries]
+
+    # Parse source[start:end] into (chunk, length, newlines) entries of whole
+    # statements. Unless it reaches the end of the source, the span must end
+    # exactly at a statement boundary.
+    def parse_span(self, source, start, end, line, whole=False):
+        bounds = list(statement_ends(source, start, end))
+        if not bounds or bounds[-1] != end:
+            if not whole and end > start:
+                return None
+            if bounds and END.match(source, bounds[-1], end):
+                # Trailing blank lines and comments join the last statement
+                bounds[-1] = end
+            elif end > start:
+                bounds.append(end)
+        entries = []
+        for stop in bounds:
+            newlines = source.count('\n', start, stop)
+            entries.append((Chunk(parse_chunk((line, source[start:stop]))), stop - start, newlines))
+            line += newlines
+            start = stop
+        self.parsed = len(entries)
+        return entries
@@ -0,0 +1,210 @@
+# Inlining: calls to small user-defined functions are replaced by a copy of
+# the function's body with the arguments substituted for the parameters, so
+# they no longer pay for the function lookup, argument list, scopes and
+# ReturnException of a call. The pass rewrites a parsed program before it
+# runs; nodes it changes are copied, so the original tree (which watch mode
+# reuses between runs) is left as it was.
+#
+# A function is inlined only where that cannot change what the program does:
+#
+#   - It is defined exactly once, by a top-level statement, and only calls
+#     after that statement are inlined (a call elsewhere might run before the
+#     definition, or reach a builtin of the same name).
+#   - Its body assigns no variables. Assignments in a function create locals
+#     that disappear when it returns (see Examples/Example8.mylang); inlined,
+#     they would land in the caller's scope. Names the body reads but does not
+#     get as parameters are looked up in the caller's scope either way, since
+#     scoping is dynamic.
+#   - It does not call itself, yield or define functions, and its body has at
+#     most INLINE_SIZE nodes.
+#   - If it has parameters, it calls no user-defined function, once calls in
+#     its own body have been inlined. A callee can read the parameters by name
+#     (scoping is dynamic); inlined, it would see the caller's variables of
+#     those names instead.
+#   - A body of just `return expr;` replaces the call anywhere it appears. A
+#     body without return statements replaces a call used as a statement.
+#   - Arguments are evaluated before the body runs. Literals and variables
+#     can be substituted freely. Any other argument only when neither it nor
+#     the body calls a function or asks for input: then evaluating it late or
+#     more than once cannot be told apart. Substituting it more than once may
+#     grow the copy, up to twice INLINE_SIZE nodes.
+#   - A parameter the body never reads drops its argument, so that argument
+#     must be a literal: anything else, even a variable, could raise an error.
+import copy
+from collections import Counter
+
+from Parser.Nodes import (Assign, Block, Bool, Call, Checkpoint, For, FuncDef, Import, IndexAssign,
+                          Input, Num, Remove, Return, Str, Var, Yield)
+from Parser.Walk import is_node, walk
+from Interpreter.Builtins import BUILTINS
+
+# Largest function body, in AST nodes, copied into its call sites
+INLINE_SIZE = 24
+
+LITERALS = (Num, Str, Bool)
+ATOMIC = LITERALS + (Var,)
+
+
+# Copy of node with each Var named in bindings replaced by a copy of the
+# bound expression
+def substitute(node, bindings):
+    if isinstance(node, Var) and node.name in bindings:
+        return substitute(bindings[node.name], {})
+    result = copy.copy(node)
+    for key, value in vars(node).items():
+        result.__dict__[key] = substitute_value(value, bindings)
+    return result
+
+
+def substitute_value(value, bindings):
+    if isinstance(value, list):
+        return [substitute_value(item, bindings) for item in value]
+    if isinstance(value, tuple):
+        return tuple(substitute_value(item, bindings) for item in value)
+    if is_node(value):
+        return substitute(value, bindings)
+    return value
+
+
+def calls_anything(node):
+    return any(isinstance(n, (Call, Input)) for n in walk(node))
+
+
+# Inliner rewrites one program. Afterwards it describes, per top-level
+# function, how many calls were inlined and kept or why it was not inlined.
+class Inliner:
+    def __init__(self, size=INLINE_SIZE, value_semantics=False):
+        self.size = size
+        # Under value semantics a parameter is a copy, so bodies that change
+        # containers through ammend/remove must keep their own scope
+        self.value_semantics = value_semantics
+        # Functions that may be inlined, by name, once their definition is passed
+        self.candidates = {}
+        # Function name -> reason it is never inlined
+        self.skipped = {}
+        # Function name -> definitions of it anywhere in the program
+        self.definitions = Counter()
+        # Function name -> calls inlined and calls left in place
+        self.inlined = Counter()
+        self.kept = Counter()
+
+    def run(self, program):
+        self.definitions = Counter(node.name for node in walk(program) if isinstance(node, FuncDef))
+        stmts = []
+        for stmt in program.stmts:
+            stmt = self.rewrite(stmt, statement=True)
+            if isinstance(stmt, FuncDef):
+                reason = self.unsuitable(stmt, self.definitions[stmt.name])
+                if reason:
+                    self.skipped[stmt.name] = reason
+                else:
+                    self.candidates[stmt.name] = stmt
+            stmts.append(stmt)
+        return Block(stmts)
+
+    # Why func_def cannot be inlined, or None if it can
+    def unsuitable(self, func_def, definitions):
+        if definitions > 1:
+            return "defined more than once"
+        if func_def.generator:
+            return "generator"
+        nodes = list(walk(func_def.body))
+        if any(isinstance(n, Call) and n.func == func_def.name for n in nodes):
+            return "recursive"
+        if any(isinstance(n, (Assign, For)) for n in nodes):
+            return "assigns local variables"
+        if any(isinstance(n, (FuncDef, Import, Checkpoint, Yield)) for n in nodes):
+            return "defines functions or imports"
+        if func_def.params and any(isinstance(n, Call) and self.user_function(n.func) for n in nodes):
+            return "calls functions that could read its parameters"
+        if self.value_semantics and any(isinstance(n, (IndexAssign, Remove)) for n in nodes):
+            return "changes a parameter under value semantics"
+        stmts = func_def.body.stmts
+        if not (len(stmts) == 1 and isinstance(stmts[0], Return)) and any(isinstance(n, Return) for n in nodes):
+            return "returns after other statements"
+        if len(nodes) > self.size:
+            return f"too large ({len(nodes)} nodes)"
+        return None
+
+    # Whether a call to name may reach a user-defined function, which takes
+    # precedence over a builtin of the same name
+    def user_function(self, name):
+        return name not in BUILTINS or self.definitions[name] > 0
+
+    # Return node, or a copy with the calls inside it inlined. statement is
+    # true for statements of a block, where a call's value is not used.
+    def rewrite(self, node, statement=False):
+        changed = {}
+        for key, value in vars(node).items():
+            if isinstance(node, Block) and key == 'stmts':
+                new = [self.rewrite(stmt, statement=True) for stmt in value]
+                if all(a is b for a, b in zip(new, value)):
+                    new = value
+            else:
+                new = self.rewrite_value(value)
+            if new is not value:
+                changed[key] = new
+        if changed:
+            node = copy.copy(node)
+            node.__dict__.update(changed)
+        if isinstance(node, Call) and node.func in self.candidates:
+            inlined = self.inline(node, statement)
+            if inlined is None:
+                self.kept[node.func] += 1
+            else:
+                self.inlined[node.func] += 1
+                return inlined
+        return node
+
+    def rewrite_value(self, value):
+        if isinstance(value, list):
+            new = [self.rewrite_value(item) for item in value]
+            return value if all(a is b for a, b in zip(new, value)) else new
+        if isinstance(value, tuple):
+            new = tuple(self.rewrite_value(item) for item in value)
+            return value if all(a is b for a, b in zip(new, value)) else new
+        if is_node(value):
+            return self.rewrite(value)
+        return value
+
+    # The replacement for call, or None when it has to stay a call
+    def inline(self, call, statement):
+        func_def = self.candidates[call.func]
+        if len(call.args) != len(func_def.params):
+            # Missing parameters would be looked up in the caller's scope
+            return None
+        bindings = dict(zip(func_def.params, call.args))
+        read = {n.name for n in walk(func_def.body) if isinstance(n, Var)}
+        if any(param not in read and not isinstance(arg, LITERALS) for param, arg in bindings.items()):
+            # The argument would never be evaluated, nor its error raised
+            return None
+        stmts = func_def.body.stmts
+        if len(stmts) == 1 and isinstance(stmts[0], Return):
+            body = stmts[0].expr
+            if not self.substitutable(bindings, body):
+                return None
+            return substitute(body, bindings)
+        if statement and all(isinstance(arg, ATOMIC) for arg in call.args):
+            return substitute(func_def.body, bindings)
+        return None
+
+    # Whether the arguments can be substituted into a `return expr;` body
+    def substitutable(self, bindings, body):
+        uses = Counter(n.name for n in walk(body) if isinstance(n, Var) and n.name in bindings)
+        size = sum(1 for _ in walk(body))
+        for param, arg in bindings.items():
+            if isinstance(arg, ATOMIC):
+                continue
+            if calls_anything(arg) or calls_anything(body):
+                return False
+            # Nothing in between can change its value, so repeating it is safe
+            size += uses[param] * (sum(1 for _ in walk(arg)) - 1)
+        return size <= 2 * self.size
+
+    def report(self):
+        lines = [f"{'function':<24}{'inlined':>10}{'kept':>10}  note"]
+        for name in self.candidates:
+            lines.append(f"{name:<24}{self.inlined[name]:>10}{self.kept[name]:>10}")
+        for name, reason in self.skipped.items():
+            lines.append(f"{name:<24}{'-':>10}{'-':>10}  {reason}")
+        return "\n".join(lines)
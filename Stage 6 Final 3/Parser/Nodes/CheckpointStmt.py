@@ -0,0 +1,3 @@
+# Checkpoint node: marks the end of a program's initialization (see Snapshot.py)
+class Checkpoint:
+    pass
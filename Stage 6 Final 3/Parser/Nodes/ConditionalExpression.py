@@ -0,0 +1,6 @@
+# Conditional expression node: cond ? then_ : else_
+class CondExpr:
+    def __init__(self, cond, then_, else_):
+        self.cond = cond
+        self.then_ = then_
+        self.else_ = else_
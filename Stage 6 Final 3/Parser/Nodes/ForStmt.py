@@ -0,0 +1,4 @@
+# For-each loop node
+class For:
+    def __init__(self, var, iterable, body):
+        self.var, self.iterable, self.body = var, iterable, body
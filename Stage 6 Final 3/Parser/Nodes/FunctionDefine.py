@@ -1,4 +1,6 @@
 # Function definition node
 class FuncDef:
-    def __init__(self, name, params, body):
+    def __init__(self, name, params, body, generator=False):
         self.name, self.params, self.body = name, params, body
+        # True when the body contains a yield: calls return a lazy iterator
+        self.generator = generator
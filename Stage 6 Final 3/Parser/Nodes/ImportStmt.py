@@ -0,0 +1,4 @@
+# Module import node
+class Import:
+    def __init__(self, path):
+        self.path = path
@@ -0,0 +1,4 @@
+# Set expression node: {a, b, ...}
+class SetExpr:
+    def __init__(self, items):
+        self.items = items
@@ -0,0 +1,4 @@
+# Yield statement node: hands a value to the consumer of a generator function
+class Yield:
+    def __init__(self, expr):
+        self.expr = expr
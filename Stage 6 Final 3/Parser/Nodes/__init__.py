@@ -15,6 +15,12 @@ from .Str import Str
 from .UnaryOp import UnaryOp
 from .Variable import Var
 from .WhileStmt import While
+from .ForStmt import For
+from .ImportStmt import Import
+from .CheckpointStmt import Checkpoint
+from .YieldStmt import Yield
 from .DictionaryExpression import DictExpr
 from .IndexAssign import IndexAssign
 from. Remove import Remove
+from .SetExpression import SetExpr
+from .ConditionalExpression import CondExpr
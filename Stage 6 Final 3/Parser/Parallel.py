@@ -0,0 +1,75 @@
+# Parallel lexing and parsing for very large sources. The source is split at
+# top-level statement boundaries (a ';' or a closing '}' outside any brackets,
+# strings and comments), the chunks are lexed and parsed in a process pool,
+# and their statements are joined into one Block, the same as a serial parse.
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from Lexer.Lexer import Lexer
+from Parser.Parser import Parser
+from Parser.Nodes import Block
+
+# Strings and comments are matched whole so brackets inside them are ignored
+SCAN = re.compile(r'"[^"]*"|#[^\n]*|[{}()\[\];]')
+# What may follow a top-level '}' for it to end a statement: a new statement
+# starting with a word, which is not the rest of the current one (else, ...)
+NEXT_WORD = re.compile(r'(?:\s|#[^\n]*)*([A-Za-z_]\w*)')
+CONTINUATIONS = {'else', 'and', 'or', 'to', 'in'}
+# Or nothing but whitespace and comments up to the end of the source
+END = re.compile(r'(?:\s|#[^\n]*)*\Z')
+
+# Chunks handed out per worker, so uneven chunks still balance
+CHUNKS_PER_WORKER = 4
+
+
+# Yield the offset just past each top-level statement in source[start:end],
+# which must begin outside any statement.
+def statement_ends(source, start=0, end=None):
+    depth = 0
+    for match in SCAN.finditer(source, start, len(source) if end is None else end):
+        ch = match.group()
+        if ch in '{([':
+            depth += 1
+            continue
+        if ch in '})]':
+            depth -= 1
+        if depth != 0 or ch not in ';}':
+            continue
+        if ch == '}':
+            word = NEXT_WORD.match(source, match.end())
+            if word and word.group(1) in CONTINUATIONS:
+                continue
+            if not word and not END.match(source, match.end()):
+                continue
+        yield match.end()
+
+
+# Split source into (first line number, text) chunks of roughly equal size.
+def split_source(source, pieces):
+    target = max(len(source) // max(pieces, 1), 1)
+    chunks = []
+    start, line = 0, 1
+    for end in statement_ends(source):
+        if end - start < target:
+            continue
+        chunks.append((line, source[start:end]))
+        line += source.count('\n', start, end)
+        start = end
+    if start < len(source):
+        chunks.append((line, source[start:]))
+    return chunks
+
+
+def parse_chunk(chunk):
+    line, text = chunk
+    return Parser(Lexer(text, line).tokenize()).parse().stmts
+
+
+def parse_parallel(source, workers=None):
+    workers = workers or os.cpu_count() or 1
+    chunks = split_source(source, workers * CHUNKS_PER_WORKER)
+    if workers == 1 or len(chunks) == 1:
+        return Block([stmt for chunk in chunks for stmt in parse_chunk(chunk)])
+    with ProcessPoolExecutor(workers) as pool:
+        return Block([stmt for stmts in pool.map(parse_chunk, chunks) for stmt in stmts])
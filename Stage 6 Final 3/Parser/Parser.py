@@ -7,10 +7,13 @@ class Parser:
     def __init__(self, tokens):
         self.tokens = tokens
         self.pos = 0  # Pointer to current token
+        # One entry per function being parsed: whether its body yields so far
+        self.yields = []
 
-    def peek(self):
-        # Look at the current token without consuming it
-        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+    def peek(self, offset=0):
+        # Look at the current (or a following) token without consuming it
+        pos = self.pos + offset
+        return self.tokens[pos] if pos < len(self.tokens) else None
 
     def advance(self):
         # Move to the next token
@@ -32,10 +35,16 @@ class Parser:
         return Block(stmts)
 
     def parse_stmt(self):
+        # Parse one statement and record the source line it starts on
         token = self.peek()
         if token is None:
             return None
+        stmt = self.parse_stmt_body(token)
+        if stmt is not None:
+            stmt.line = token.line
+        return stmt
 
+    def parse_stmt_body(self, token):
         match token.type:
             case "PRINT":
                 self.advance()
@@ -59,6 +68,16 @@ class Parser:
                 self.match("RPAREN")
                 return While(cond, self.parse_block())
 
+            case "FOR":
+                # for (name in collection) { ... }
+                self.advance()
+                self.match("LPAREN")
+                var = self.match("IDENT").value
+                self.match("IN")
+                iterable = self.parse_expr()
+                self.match("RPAREN")
+                return For(var, iterable, self.parse_block())
+
             case "FUNCTION":
                 self.advance()
                 name = self.match("IDENT").value
@@ -70,8 +89,32 @@ class Parser:
                         if self.match("RPAREN"):
                             break
                         self.match("COMMA")
+                self.yields.append(False)
                 body = self.parse_block()
-                return FuncDef(name, params, body)
+                return FuncDef(name, params, body, generator=self.yields.pop())
+
+            case "IMPORT":
+                # import "path/to/module.mylang";
+                self.advance()
+                path = self.match("STRING").value
+                self.match("SEMICOLON")
+                return Import(path)
+
+            case "CHECKPOINT":
+                # checkpoint; (end of initialization, see Interpreter/Snapshot.py)
+                self.advance()
+                self.match("SEMICOLON")
+                return Checkpoint()
+
+            case "YIELD":
+                # yield value; (makes the enclosing function a generator)
+                self.advance()
+                if not self.yields:
+                    raise RuntimeError(f"'yield' outside a function on line {token.line}")
+                self.yields[-1] = True
+                expr = self.parse_expr()
+                self.match("SEMICOLON")
+                return Yield(expr)
 
             case "RETURN":
                 self.advance()
@@ -105,10 +148,11 @@ class Parser:
                 self.match("SEMICOLON")
                 return Remove(target.base, target.index)
 
-            case "IDENT":
-                if (ident := self.match("IDENT")) and self.match("ASSIGN"):
-                    expr = self.parse_expr(); self.match("SEMICOLON")
-                    return Assign(ident.value, expr)
+            case "IDENT" if (nxt := self.peek(1)) and nxt.type == "ASSIGN":
+                ident = self.match("IDENT")
+                self.match("ASSIGN")
+                expr = self.parse_expr(); self.match("SEMICOLON")
+                return Assign(ident.value, expr)
             case _:
                 # Fallback: treat it as an expression statement
                 expr = self.parse_expr()
@@ -118,17 +162,30 @@ class Parser:
 
     def parse_block(self):
         # Parse a block enclosed in { ... }
-        self.match("LBRACE")
+        opening = self.match("LBRACE")
         stmts = []
         while not self.match("RBRACE"):
+            if self.peek() is None:
+                where = f" opened on line {opening.line}" if opening else ""
+                raise RuntimeError(f"Missing '}}' at the end of the block{where}")
             stmts.append(self.parse_stmt())
         return Block(stmts)
 
     def parse_expr(self):
-        return self.parse_or()
+        return self.parse_conditional()
 
     # --- Operator Precedence Handling (lowest to highest) ---
 
+    # cond ? a : b, grouping to the right: a ? b : c ? d : e
+    def parse_conditional(self):
+        node = self.parse_or()
+        if self.match("QUESTION"):
+            then_ = self.parse_expr()
+            if not self.match("COLON"):
+                raise RuntimeError("Expected ':' in conditional expression")
+            node = CondExpr(node, then_, self.parse_conditional())
+        return node
+
     def parse_or(self):
         node = self.parse_and()
         while self.match("OR"):
@@ -191,9 +248,20 @@ class Parser:
             self.advance()
             return Bool(tok.value)
 
-        # Identifiers: variables, function calls, indexing
+        # Identifiers: variables, function calls, indexing (possibly chained, e.g. data["rows"][0])
         if tok.type == "IDENT":
             self.advance()
+            name = tok.value
+            # Module-qualified function name, e.g. strings.join(...)
+            if self.peek() and self.peek().type == "DOT":
+                self.advance()
+                member = self.match("IDENT")
+                if not member:
+                    raise RuntimeError(f"Expected a function name after '{name}.' on line {tok.line}")
+                name += "." + member.value
+                # Only module functions have qualified names; there are no attributes
+                if not (self.peek() and self.peek().type == "LPAREN"):
+                    raise RuntimeError(f"'{name}' on line {tok.line} must be called, as {name}(...)")
             if self.match("LPAREN"):
                 args = []
                 if not self.match("RPAREN"):
@@ -202,12 +270,14 @@ class Parser:
                         if self.match("RPAREN"):
                             break
                         self.match("COMMA")
-                return Call(tok.value, args)
-            elif self.match("LBRACKET"):
+                node = Call(name, args)
+            else:
+                node = Var(tok.value)
+            while self.match("LBRACKET"):
                 index = self.parse_expr()
                 self.match("RBRACKET")
-                return IndexExpr(Var(tok.value), index)
-            return Var(tok.value)
+                node = IndexExpr(node, index)
+            return node
 
         # Input expression
         if tok.type == "INPUT":
@@ -236,13 +306,15 @@ class Parser:
                     self.match("COMMA")
             return ListExpr(items)
 
-        # Dictionary literal
+        # Dictionary literal, or a set literal when the first item has no key
         if tok.type == "LBRACE":
             self.advance()
             pairs = []
             if not self.match("RBRACE"):
                 while True:
                     k = self.parse_expr()
+                    if not pairs and not (self.peek() and self.peek().type == "COLON"):
+                        return self.parse_set(k)
                     self.match("COLON")
                     v = self.parse_expr()
                     pairs.append((k, v))
@@ -252,4 +324,12 @@ class Parser:
             return DictExpr(pairs)
 
         raise RuntimeError(f"Unexpected token: {tok}")
+
+    # The rest of a set literal whose first item has been parsed
+    def parse_set(self, first):
+        items = [first]
+        while not self.match("RBRACE"):
+            self.match("COMMA")
+            items.append(self.parse_expr())
+        return SetExpr(items)
        
\ No newline at end of file
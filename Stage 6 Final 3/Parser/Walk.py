@@ -0,0 +1,30 @@
+# Generic AST traversal: yields a node and every node nested inside it.
+# Children are found through the node's attributes, including lists of
+# nodes (Block.stmts, Call.args) and the (key, value) pairs of DictExpr.
+from Parser import Nodes
+
+# Every AST node class (specialized variants are subclasses of these)
+NODE_TYPES = tuple(v for v in vars(Nodes).values() if isinstance(v, type))
+
+def children(node):
+    for value in vars(node).values():
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, tuple):
+                    yield from (x for x in item if is_node(x))
+                elif is_node(item):
+                    yield item
+        elif is_node(value):
+            yield value
+
+
+def is_node(value):
+    return isinstance(value, NODE_TYPES)
+
+
+def walk(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(children(node))
@@ -0,0 +1,19 @@
+# Helpers shared by the tests: parse a source string and run it, capturing
+# what it prints.
+import io
+
+from Lexer.Lexer import Lexer
+from Parser.Parser import Parser
+from Interpreter.Interpreter import Interpreter
+
+
+def parse(source):
+    return Parser(Lexer(source).tokenize()).parse()
+
+
+# Run source (or an already parsed program) and return its printed lines
+def run(source, interpreter=None, **options):
+    interpreter = interpreter or Interpreter(**options)
+    interpreter.output = io.StringIO()
+    interpreter.eval(parse(source) if isinstance(source, str) else source)
+    return interpreter.output.getvalue().splitlines()
@@ -0,0 +1,79 @@
+import io
+import unittest
+
+from Interpreter.CallTracer import CallTracer
+from Interpreter.Coverage import Coverage
+from Interpreter.Interpreter import Interpreter
+from tests.support import parse, run
+
+FUNCTIONS = """
+function fail(x) { return x[5]; }
+function outer(x) { return fail(x); }
+function ok(x) { return x; }
+"""
+
+
+class CallTracerTest(unittest.TestCase):
+    def test_depth_recovers_after_caught_error(self):
+        out = io.StringIO()
+        tracer = CallTracer(out)
+        interpreter = Interpreter()
+        interpreter.hooks.install(tracer)
+        run(FUNCTIONS, interpreter)
+        with self.assertRaises(IndexError):
+            run('outer([1]);', interpreter)
+        self.assertEqual(tracer.depth, 0)
+
+        run('ok(1);', interpreter)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[2].startswith("  ✗ fail"))
+        self.assertTrue(lines[3].startswith("✗ outer"))
+        # The next call is traced at the top level again
+        self.assertEqual(lines[4], "→ ok(1.0)")
+
+    def test_every_call_is_matched(self):
+        events = []
+        interpreter = Interpreter()
+        for event in ('call', 'return', 'unwind'):
+            interpreter.hooks.add(event, lambda func_def, value, event=event: events.append(event))
+        run(FUNCTIONS + 'ok(1);', interpreter)
+        with self.assertRaises(IndexError):
+            run('outer([1]);', interpreter)
+        self.assertEqual(events, ['call', 'return', 'call', 'call', 'unwind', 'unwind'])
+
+
+GENERATOR = """function evens(n) {
+    i = 0;
+    while (i < n) {
+        if (i != 1) {
+            yield i;
+        }
+        i = i + 1;
+    }
+}
+for (x in evens(4)) {
+    print x;
+}
+"""
+
+
+class GeneratorHooksTest(unittest.TestCase):
+    def test_coverage_of_generator_lines(self):
+        program = parse(GENERATOR)
+        coverage = Coverage()
+        interpreter = Interpreter()
+        interpreter.hooks.install(coverage)
+        self.assertEqual(run(program, interpreter), ["0", "2", "3"])
+        self.assertEqual(coverage.executable_lines(program) - coverage.executed, set())
+
+    def test_exception_inside_generator_loop(self):
+        errors = []
+        interpreter = Interpreter()
+        interpreter.hooks.add('exception', lambda node, error: errors.append(type(node).__name__))
+        with self.assertRaises(IndexError):
+            run('function g(xs) { for (x in xs) { yield xs[5]; } } for (y in g([1])) { print y; }', interpreter)
+        self.assertEqual(errors, ['IndexExpr'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+
+from Parser.Incremental import IncrementalParser
+from Parser.Walk import is_node
+from tests.support import parse
+
+BROKEN = ('x = 1;\nif (x > 0) {\n  print 1;\n}\nprint 2;\n',
+          'x = 1;\nif (x > 0) {\n  print 1;\n\nprint 2;\n')
+
+# Statements the fuzz test builds sources from, one or more lines each
+STATEMENTS = [
+    'x = {n};',
+    'print x + {n};',
+    '# note {n}\nprint {n};',
+    'if (x > {n}) {{\n  print x;\n}}',
+    'if (x > {n}) {{\n  print x;\n}} else {{\n  print {n};\n}}',
+    'while (x < {n}) {{\n  x = x + 1;\n}}',
+    'function f{n}(a) {{\n  return a + {n};\n}}',
+    'for (i in range({n})) {{ print i; }}',
+]
+
+
+# Type, attributes and line numbers of a tree, for comparing two parses
+def dump(value):
+    if isinstance(value, (list, tuple)):
+        return [dump(item) for item in value]
+    if is_node(value):
+        return (type(value).__name__, {key: dump(item) for key, item in vars(value).items()})
+    return value
+
+
+def statement(rng):
+    return rng.choice(STATEMENTS).format(n=rng.randrange(100))
+
+
+# A random edit of a list of statements: replace, insert or delete one, or
+# append an else to an if
+def edit(rng, stmts):
+    stmts = list(stmts)
+    i = rng.randrange(len(stmts))
+    kind = rng.randrange(4)
+    if kind == 0:
+        stmts[i] = statement(rng)
+    elif kind == 1:
+        stmts.insert(i, statement(rng))
+    elif kind == 2 and len(stmts) > 1:
+        del stmts[i]
+    elif stmts[i].startswith('if') and 'else' not in stmts[i]:
+        stmts[i] += ' else { print 0; }'
+    return stmts
+
+
+class IncrementalParserTest(unittest.TestCase):
+    def test_edits_match_full_parse(self):
+        rng = random.Random(40)
+        for _ in range(40):
+            parser = IncrementalParser()
+            stmts = [statement(rng) for _ in range(rng.randrange(1, 12))]
+            parser.parse('\n'.join(stmts) + '\n')
+            for _ in range(15):
+                stmts = edit(rng, stmts)
+                source = '\n'.join(stmts) + '\n'
+                self.assertEqual(dump(parser.parse(source)), dump(parse(source)), source)
+
+    def test_unclosed_block_is_an_error(self):
+        parser = IncrementalParser()
+        parser.parse(BROKEN[0])
+        with self.assertRaisesRegex(RuntimeError, "opened on line 2"):
+            parser.parse(BROKEN[1])
+        with self.assertRaisesRegex(RuntimeError, "Missing '}'"):
+            parse(BROKEN[1])
+
+    def test_fixed_after_unclosed_block(self):
+        # As in watch mode: a broken save, then one that fixes it
+        parser = IncrementalParser()
+        parser.parse(BROKEN[0])
+        with self.assertRaises(RuntimeError):
+            parser.parse(BROKEN[1])
+        fixed = BROKEN[0].replace('print 2;', 'print 3;')
+        self.assertEqual(dump(parser.parse(fixed)), dump(parse(fixed)))
+
+    def test_unclosed_block_in_first_parse(self):
+        with self.assertRaises(RuntimeError):
+            IncrementalParser().parse(BROKEN[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
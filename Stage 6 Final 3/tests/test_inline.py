@@ -0,0 +1,66 @@
+import unittest
+
+from Parser.Inline import Inliner
+from tests.support import parse, run
+
+
+def inlined(source):
+    inliner = Inliner()
+    return inliner, inliner.run(parse(source))
+
+
+class InlineTest(unittest.TestCase):
+    def test_callee_reads_parameter(self):
+        # g sees f's parameter x, not the global x (scoping is dynamic)
+        source = "function g() { t = x * 10; return t; } function f(x) { return g() + x; } x = 1; print f(5);"
+        self.assertEqual(run(source), ["55"])
+        inliner, program = inlined(source)
+        self.assertEqual(run(program), ["55"])
+        self.assertEqual(inliner.inlined['f'], 0)
+        self.assertIn('f', inliner.skipped)
+
+    def test_builtin_and_inlined_calls(self):
+        # square is inlined into dist2 first, leaving it no calls
+        source = """
+function square(x) { return x * x; }
+function size(xs) { return len(xs); }
+function dist2(a, b) { return square(a) + square(b); }
+xs = [1, 2];
+print dist2(3, 4) + size(xs);
+"""
+        inliner, program = inlined(source)
+        self.assertEqual(run(program), run(source))
+        self.assertEqual(inliner.inlined['dist2'], 1)
+        self.assertEqual(inliner.inlined['size'], 1)
+
+    def test_user_function_named_like_builtin(self):
+        source = "function len(xs) { t = y; return t; } function f(y) { return len([]); } y = 1; print f(2);"
+        inliner, program = inlined(source)
+        self.assertEqual(run(program), ["2"])
+        self.assertIn('f', inliner.skipped)
+
+
+    def test_unused_argument_that_raises(self):
+        source = "function one(a) { return 1; } xs = [1]; print one(xs[5]);"
+        with self.assertRaises(IndexError):
+            run(source)
+        inliner, program = inlined(source)
+        with self.assertRaises(IndexError):
+            run(program)
+        self.assertEqual(inliner.kept['one'], 1)
+
+    def test_unused_undefined_variable(self):
+        source = 'function show(a) { print "called"; } show(typo);'
+        inliner, program = inlined(source)
+        with self.assertRaisesRegex(RuntimeError, "typo"):
+            run(program)
+        self.assertEqual(inliner.inlined['show'], 0)
+
+    def test_unused_literal_argument(self):
+        inliner, program = inlined('function one(a) { return 1; } print one("x") + one(2);')
+        self.assertEqual(run(program), ["2"])
+        self.assertEqual(inliner.inlined['one'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from Interpreter.Interpreter import Interpreter
+from Parser.Nodes import FuncDef
+from tests.support import parse, run
+
+# Each case defines functions and calls every one of them three times, so
+# that with jit_threshold=1 the later calls run compiled code
+CASES = {
+    'no return': """
+function last(x) { y = x + 1; }
+function branch(x) { if (x > 1) { y = 1; } else { y = 2; } }
+function loop(x) { while (x < 3) { x = x + 1; } }
+function expression(x) { x * 2; }
+function nothing() { }
+for (i in range(3)) { print last(i); print branch(i); print loop(i); print expression(i); print nothing(); }
+""",
+    'caller scope': """
+function reads() { return outer * 2; }
+function caller(outer) { return reads(); }
+function shadowed(x) { if (x > 1) { g = 100; } return g + x; }
+function sets() { v = 7; return peek(); }
+function peek() { return v; }
+g = 5;
+v = 1;
+for (i in range(3)) { print caller(i); print shadowed(i); print sets(); print v; }
+""",
+    'missing arguments': """
+function two(a, b) { return a + b; }
+function uses(b) { return two(1); }
+b = 10;
+for (i in range(3)) { print two(i); print two(i, 1); print uses(i); }
+""",
+    'plus': """
+function add(a, b) { return a + b; }
+function half(a) { return a / 2 + 0.5; }
+for (i in range(3)) {
+    print add(i, 2); print add(1.5, i); print add("n", i); print add(i, "s");
+    print add("a", "b"); print add([i], [1]); print add(half(i), 1);
+}
+""",
+}
+
+
+class JITTest(unittest.TestCase):
+    def test_compiled_matches_interpreted(self):
+        for name, source in CASES.items():
+            expected = run(source, jit=False)
+            program = parse(source)
+            interpreter = Interpreter(jit_threshold=1)
+            self.assertEqual(run(program, interpreter), expected, name)
+            # Every function was compiled, and so ran compiled at least once
+            compiled = {func.name for func, code in interpreter.jit.compiled.items() if code}
+            self.assertEqual(compiled, {stmt.name for stmt in program.stmts if isinstance(stmt, FuncDef)}, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from Interpreter.Exceptions import MemoryLimitError
+from Interpreter.Interpreter import Interpreter
+from tests.support import run
+
+LIMIT = 1 << 20
+
+# Numeric keys and a shared value: nearly all the memory is the dict itself
+FILL_GLOBAL = """
+d = {};
+i = 0;
+while (i < 500000) { ammend d[i] to true; i = i + 1; }
+"""
+
+FILL_IN_FUNCTION = """
+function fill(d, n) {
+    i = 0;
+    while (i < n) { ammend d[i] to true; i = i + 1; }
+}
+d = {};
+k = 0;
+while (k < 500) { fill(d, k * 1000); k = k + 1; }
+"""
+
+
+class MemoryLimitTest(unittest.TestCase):
+    def assert_stops_near_limit(self, source, **options):
+        interpreter = Interpreter(memory_limit=LIMIT, **options)
+        with self.assertRaises(MemoryLimitError):
+            run(source, interpreter)
+        # Checks may overshoot by at most a quarter of the limit
+        self.assertLessEqual(interpreter.memory.current, LIMIT * 5 // 4)
+
+    def test_dict_growth_counts_towards_limit(self):
+        self.assert_stops_near_limit(FILL_GLOBAL)
+
+    def test_dict_growth_in_compiled_function(self):
+        self.assert_stops_near_limit(FILL_IN_FUNCTION, jit_threshold=1)
+
+    def test_store_reports_new_key_and_growth(self):
+        interpreter = Interpreter()
+        before = interpreter.memory.allocated
+        run('d = {}; ammend d["a fairly long key"] to 1;', interpreter)
+        # More than the value alone: the key and the dict's own table too
+        self.assertGreater(interpreter.memory.allocated - before, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from Parser.Nodes import Call, Print, Var
+from tests.support import parse
+
+
+class QualifiedNameTest(unittest.TestCase):
+    def test_module_function_call(self):
+        stmt = parse('print strings.repeat("ab", 3);').stmts[0]
+        self.assertIsInstance(stmt, Print)
+        self.assertIsInstance(stmt.expr, Call)
+        self.assertEqual(stmt.expr.func, "strings.repeat")
+
+    def test_plain_variable(self):
+        self.assertIsInstance(parse('print y;').stmts[0].expr, Var)
+
+    def test_qualified_name_without_call_is_an_error(self):
+        with self.assertRaisesRegex(RuntimeError, r"'y\.z' on line 2 must be called"):
+            parse('y = 1;\nprint y.z;')
+
+    def test_missing_name_after_dot(self):
+        with self.assertRaisesRegex(RuntimeError, r"Expected a function name after 'y\.'"):
+            parse('print y.;')
+
+
+if __name__ == '__main__':
+    unittest.main()
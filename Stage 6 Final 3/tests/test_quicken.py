@@ -0,0 +1,54 @@
+import unittest
+
+from Interpreter.Interpreter import Interpreter
+from Interpreter.Quicken import AddNumbers, LocalVar
+from Parser.Nodes import BinOp
+from Parser.Walk import walk
+from tests.support import parse, run
+
+LOOP = """
+function add(a, b) { return a + b; }
+i = 0;
+while (i < 50) { r = add(i, 1); i = i + 1; }
+print r;
+"""
+
+
+class QuickenTest(unittest.TestCase):
+    def test_hot_nodes_are_specialized(self):
+        program = parse(LOOP)
+        self.assertEqual(run(program), ["50"])
+        kinds = {type(node) for node in walk(program)}
+        self.assertIn(AddNumbers, kinds)
+        self.assertIn(LocalVar, kinds)
+
+    def test_failed_guard_without_quickener(self):
+        # Nodes quickened by one interpreter, then run by one that does not
+        # quicken (as with shared modules, snapshots and prepared programs)
+        program = parse(LOOP)
+        run(program, jit=False)
+        add = program.stmts[0]
+        self.assertIsInstance(add.body.stmts[0].expr, AddNumbers)
+
+        plain = Interpreter(quicken=False, jit=False)
+        plain.functions['add'] = add
+        self.assertEqual(run('print add("a", "b");', plain), ["ab"])
+        self.assertIs(type(add.body.stmts[0].expr), BinOp)
+
+    def test_deopt_is_counted_by_specializing_quickener(self):
+        program = parse(LOOP)
+        first = Interpreter(jit=False)
+        run(program, first)
+        other = Interpreter(jit=False)
+        other.functions['add'] = program.stmts[0]
+        run('print add("a", "b");', other)
+        self.assertEqual(first.quickener.stats()['add number+number']['deopts'], 1)
+        self.assertEqual(other.quickener.stats()['add number+number']['deopts'], 0)
+
+    def test_results_match_generic_evaluation(self):
+        source = 'xs = [1, 2, 3]; t = 0; i = 0; while (i < 30) { t = t + xs[1] * i - 1; i = i + 1; } print t;'
+        self.assertEqual(run(source), run(source, quicken=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
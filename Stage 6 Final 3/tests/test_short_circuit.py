@@ -0,0 +1,42 @@
+import unittest
+
+from Interpreter.Interpreter import Interpreter
+from tests.support import parse, run
+
+# Each operand prints its name, so the output shows which of them ran
+OPERANDS = """
+function yes(name) { print name; return true; }
+function no(name) { print name; return false; }
+"""
+
+CASES = [
+    ('no("a") and yes("b")', ["a", "False"]),
+    ('yes("a") and no("b")', ["a", "b", "False"]),
+    ('yes("a") or no("b")', ["a", "True"]),
+    ('no("a") or yes("b")', ["a", "b", "True"]),
+    ('no("a") and yes("b") or yes("c")', ["a", "c", "True"]),
+    ('yes("a") ? yes("b") : no("c")', ["a", "b", "True"]),
+    ('no("a") ? yes("b") : no("c")', ["a", "c", "False"]),
+    ('yes("a") ? no("b") ? yes("c") : no("d") : yes("e")', ["a", "b", "d", "False"]),
+]
+
+
+class ShortCircuitTest(unittest.TestCase):
+    def test_interpreted(self):
+        for expr, expected in CASES:
+            self.assertEqual(run(f"{OPERANDS} print {expr};", jit=False), expected, expr)
+
+    def test_jit_compiled(self):
+        for expr, expected in CASES:
+            program = parse(f"{OPERANDS} function check() {{ return {expr}; }}")
+            interpreter = Interpreter(jit_threshold=1)
+            run(program, interpreter)
+            # The first call is interpreted and compiles check; the second
+            # runs the compiled code
+            run("check();", interpreter)
+            self.assertIsNotNone(interpreter.jit.compiled.get(interpreter.functions['check']), expr)
+            self.assertEqual(run("print check();", interpreter), expected, expr)
+
+
+if __name__ == '__main__':
+    unittest.main()
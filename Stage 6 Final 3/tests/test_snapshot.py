@@ -0,0 +1,65 @@
+import io
+import os
+import tempfile
+import unittest
+
+from Interpreter.Interpreter import Interpreter
+from Interpreter.Quicken import QUICKENED
+from Interpreter.Snapshot import load_snapshot, run_with_snapshot
+from Parser.Walk import walk
+from tests.support import parse
+
+# The loop in add() is hot before the checkpoint, so its nodes are quickened
+# when the snapshot is taken
+SOURCE = """
+function add(a, b) { return a + b; }
+i = 0;
+while (i < 50) { r = add(i, 1); i = i + 1; }
+checkpoint;
+print add(r, 1);
+print add("a", "b");
+"""
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.snapshot')
+        os.close(handle)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    # Run source, writing the snapshot or resuming from it
+    def run_program(self, source=SOURCE, **options):
+        interpreter = Interpreter(jit=False, **options)
+        interpreter.output = io.StringIO()
+        run_with_snapshot(interpreter, source, lambda: parse(source), self.path)
+        return interpreter, interpreter.output.getvalue().splitlines()
+
+    def test_quickened_nodes_are_saved_generic(self):
+        interpreter, lines = self.run_program()
+        self.assertEqual(lines, ["51", "ab"])
+        self.assertTrue(interpreter.quickener.stats()['add number+number']['hits'])
+
+        snapshot = load_snapshot(self.path, SOURCE)
+        nodes = [node for func in snapshot.functions.values() for node in walk(func)]
+        self.assertFalse([node for node in nodes if type(node) in QUICKENED])
+        self.assertFalse([node for node in nodes if 'quickener' in vars(node)])
+
+    def test_restore_without_quickening(self):
+        self.run_program()
+        _, lines = self.run_program(quicken=False)
+        self.assertEqual(lines, ["51", "ab"])
+
+    def test_restore_with_value_semantics(self):
+        source = "table = [1, 2, 3]; checkpoint; copy = table; ammend copy[0] to 99; print table[0];"
+        _, lines = self.run_program(source)
+        self.assertEqual(lines, ["99"])
+        _, lines = self.run_program(source, value_semantics=True)
+        self.assertEqual(lines, ["1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from Interpreter.Interpreter import Interpreter
+from tests.support import run
+
+SOURCE = """
+function depth(n) { return n == 0 ? 0 : 1 + depth(n - 1); }
+function gen(n) { for (i in range(n)) { yield i; } }
+total = 0;
+i = 0;
+while (i < 30) { total = total + depth(3); i = i + 1; }
+for (x in gen(3)) { total = total + x; }
+print total;
+"""
+
+
+class StatsTest(unittest.TestCase):
+    def test_counters(self):
+        for options in ({'jit': False}, {'jit_threshold': 1}):
+            interpreter = Interpreter(**options)
+            self.assertEqual(run(SOURCE, interpreter), ["93"])
+            snapshot = interpreter.stats.snapshot()
+            self.assertEqual(snapshot['function_calls'], 121, options)
+            self.assertEqual(snapshot['max_call_depth'], 4, options)
+            self.assertEqual(interpreter.stats.depth, 0)
+
+    def test_disabled(self):
+        for options in ({'jit': False}, {'jit_threshold': 1}):
+            interpreter = Interpreter(stats=False, **options)
+            self.assertEqual(run(SOURCE, interpreter), ["93"])
+            snapshot = interpreter.stats.snapshot()
+            self.assertEqual(snapshot['function_calls'], 0, options)
+            self.assertEqual(snapshot['environments_created'], 0, options)
+            self.assertEqual(snapshot['max_call_depth'], 0, options)
+            # Spawned interpreters inherit the setting
+            self.assertFalse(interpreter.spawn().stats.enabled)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from Interpreter.Program import Program
+from tests.support import run
+
+CHANGE = "ammend xs[0] to 99; return xs[0];"
+
+
+class ProgramGlobalsTest(unittest.TestCase):
+    def test_injected_list_is_not_changed(self):
+        program = Program.prepare(CHANGE, value_semantics=True)
+        xs = [1, 2]
+        self.assertEqual(program.run({"xs": xs}).value, 99)
+        self.assertEqual(xs, [1, 2])
+
+    def test_globals_of_one_run_injected_into_another(self):
+        program = Program.prepare("xs = [1, 2];", value_semantics=True)
+        first = program.run()
+        change = Program.prepare(CHANGE, value_semantics=True)
+        self.assertEqual(change.run(first.globals).value, 99)
+        self.assertEqual(first.globals["xs"], [1, 2])
+
+    def test_reference_semantics_unchanged(self):
+        program = Program.prepare(CHANGE)
+        xs = [1, 2]
+        program.run({"xs": xs})
+        self.assertEqual(xs, [99, 2])
+
+
+class BuiltinArgumentsTest(unittest.TestCase):
+    def test_pushed_list_is_a_value(self):
+        source = "a = [1]; q = deque(); push(q, a); ammend a[0] to 99; print peek(q)[0]; print a[0];"
+        self.assertEqual(run(source, value_semantics=True), ["1", "99"])
+
+    def test_pushed_list_changed_through_collection(self):
+        source = "a = [1]; q = deque(); push(q, a); ammend q[0][0] to 99; print peek(q)[0]; print a[0];"
+        self.assertEqual(run(source, value_semantics=True), ["99", "1"])
+
+    def test_pushed_front_list_is_a_value(self):
+        source = "a = [1]; q = deque(); push_front(q, a); ammend a[0] to 99; print q[0][0];"
+        self.assertEqual(run(source, value_semantics=True), ["1"])
+
+    def test_collection_items_are_values(self):
+        # xs[0] is not shared yet: it was stored by ammend from a literal
+        for make in ("deque(xs)", "heap(xs)"):
+            source = f"xs = [0]; ammend xs[0] to [1]; c = {make}; ammend xs[0][0] to 9; print c[0][0];"
+            self.assertEqual(run(source, value_semantics=True), ["1"], make)
+        source = "xs = [0]; ammend xs[0] to [1]; d = deque(xs); ammend d[0][0] to 9; print xs[0][0]; print d[0][0];"
+        self.assertEqual(run(source, value_semantics=True), ["1", "9"])
+
+
+class LoopVariableTest(unittest.TestCase):
+    def test_generator_loop_variable_is_a_value(self):
+        source = """
+function changed(rows) { for (row in rows) { ammend row[0] to 99; yield row; } }
+# rows[0] is not shared yet: it was stored by ammend from a literal
+rows = [0];
+ammend rows[0] to [1, 2];
+for (r in changed(rows)) { print r[0]; }
+print rows[0][0];
+"""
+        self.assertEqual(run(source, value_semantics=True), ["99", "1"])
+
+    def test_rows_from_builtin_iterators(self):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as f:
+            f.write("k\n1\n")
+        self.addCleanup(os.remove, path)
+        for rows in ("read_csv", "iter_csv"):
+            source = f'for (row in {rows}("{path}", true)) {{ alias = row; ammend alias["k"] to "changed"; print row["k"]; }}'
+            self.assertEqual(run(source, value_semantics=True), ["1"], rows)
+
+
+if __name__ == '__main__':
+    unittest.main()